@@ -0,0 +1,314 @@
+"""Headless batch processing of image files with ``CanvasDocument`` operations, one process per core."""
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TextIO
+
+from core.color import parse_color
+from core.document import CanvasDocument
+from core.pixel_buffer import TRANSPARENT_COLOR, Bitmap
+from core.png import read_png, write_png
+from core.transform import flattened, scaled
+from utils.file_config import (
+    COLOR_WHITE,
+    IMAGE_FORMAT_BMP,
+    IMAGE_FORMAT_JPEG,
+    IMAGE_FORMAT_PNG,
+    SUPPORTED_EXTENSIONS,
+    infer_image_format,
+)
+from utils.ui_text import (
+    BATCH_DESCRIPTION,
+    BATCH_DUPLICATE_OUTPUT_FMT,
+    BATCH_FAILED_FMT,
+    BATCH_FAILURE_FMT,
+    BATCH_FAILURES_HEADER,
+    BATCH_NO_FILES,
+    BATCH_NOT_POSITIVE_FMT,
+    BATCH_OUT_OF_BOUNDS_FMT,
+    BATCH_PROGRESS_FMT,
+    BATCH_READ_ERROR_FMT,
+    BATCH_SUMMARY_FMT,
+    BATCH_TOLERANCE_RANGE_FMT,
+    BATCH_WRITE_ERROR_FMT,
+)
+
+BATCH_COMMAND = "batch"
+MAX_TOLERANCE = 255
+OUTPUT_EXTENSIONS = {IMAGE_FORMAT_PNG: ".png", IMAGE_FORMAT_JPEG: ".jpg", IMAGE_FORMAT_BMP: ".bmp"}
+
+
+@dataclass(frozen=True)
+class Operation:
+    name: str
+    args: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    background_color: int = TRANSPARENT_COLOR
+    tolerance: int = 0
+    wrap: bool = False
+
+
+@dataclass(frozen=True)
+class BatchTask:
+    source: str
+    destination: str
+    output_format: str
+    operations: tuple[Operation, ...]
+    options: BatchOptions
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    source: str
+    destination: str
+    seconds: float
+    error: str | None = None
+
+
+def main(argv: Sequence[str] | None = None, stream: TextIO = sys.stdout) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    sources = find_images(args.patterns)
+    if not sources:
+        parser.error(BATCH_NO_FILES)
+
+    options = BatchOptions(args.background, args.tolerance, args.wrap)
+    tasks = [
+        BatchTask(
+            source,
+            output_path(source, args.output_dir, args.format),
+            args.format or infer_image_format(source),
+            tuple(args.operations or ()),
+            options,
+        )
+        for source in sources
+    ]
+    destinations = [task.destination for task in tasks]
+    for destination in destinations:
+        if destinations.count(destination) > 1:
+            parser.error(BATCH_DUPLICATE_OUTPUT_FMT.format(path=destination))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    return report(run_tasks(tasks, args.jobs), len(tasks), stream)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tilf batch", description=BATCH_DESCRIPTION)
+    parser.add_argument("patterns", nargs="+", metavar="PATTERN", help="image files or glob patterns, ** included")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory the processed files are written to")
+    parser.add_argument(
+        "-f", "--format", type=str.upper, choices=tuple(OUTPUT_EXTENSIONS),
+        help="output format; defaults to the format of each source file",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=_positive_int, default=os.cpu_count() or 1, help="worker processes (default: all cores)",
+    )
+    parser.add_argument(
+        "--background", type=_color, default=TRANSPARENT_COLOR,
+        help="current background color of the sources, replaced by --replace-background (default: transparent)",
+    )
+    parser.add_argument(
+        "--tolerance", type=_tolerance, default=0, help=f"per-channel tolerance of the fills, 0 to {MAX_TOLERANCE}",
+    )
+    parser.add_argument("--wrap", action="store_true", help="wrap pixels shifted past an edge around")
+
+    operations = parser.add_argument_group("operations", "applied to every file in the order given")
+    _add_operation(operations, "--fill", (int, int, _color), ("COL", "ROW", "COLOR"), "flood fill from a pixel")
+    _add_operation(
+        operations, "--global-fill", (int, int, _color), ("COL", "ROW", "COLOR"),
+        "recolor every pixel matching the given one",
+    )
+    _add_operation(operations, "--replace-background", (_color,), ("COLOR",), "swap the background color")
+    _add_operation(operations, "--shift", (int, int), ("DX", "DY"), "move the pixels")
+    _add_operation(operations, "--scale", (_positive_int,), ("FACTOR",), "enlarge by a whole factor")
+    _add_operation(operations, "--resize", (_positive_int, _positive_int), ("WIDTH", "HEIGHT"), "resample to a size")
+    return parser
+
+
+def find_images(patterns: Sequence[str]) -> list[str]:
+    paths = {
+        os.path.normpath(path)
+        for pattern in patterns
+        for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS)
+    }
+    return sorted(paths)
+
+
+def output_path(source: str, output_dir: str, output_format: str | None) -> str:
+    stem, extension = os.path.splitext(os.path.basename(source))
+    if output_format is not None:
+        extension = OUTPUT_EXTENSIONS[output_format]
+    return os.path.join(output_dir, stem + extension)
+
+
+def run_tasks(tasks: Sequence[BatchTask], jobs: int) -> Iterator[BatchResult]:
+    """Yield each file's result as soon as it is done, processing up to ``jobs`` files at once."""
+    if jobs == 1 or len(tasks) == 1:
+        yield from map(process_file, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        futures = [executor.submit(process_file, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def process_file(task: BatchTask) -> BatchResult:
+    started = time.perf_counter()
+    try:
+        document = load_document(read_bitmap(task.source), task.options.background_color)
+        for operation in task.operations:
+            apply_operation(document, operation, task.options)
+        write_bitmap(task.destination, (document.columns, document.rows, document.pixels), task.output_format)
+    except Exception as error:
+        return BatchResult(task.source, task.destination, time.perf_counter() - started, str(error) or repr(error))
+    return BatchResult(task.source, task.destination, time.perf_counter() - started)
+
+
+def load_document(bitmap: Bitmap, background_color: int) -> CanvasDocument:
+    columns, rows, pixels = bitmap
+    document = CanvasDocument(0, 0, background_color, history_limit=0, tile_size=1)
+    document.load_pixels(columns, rows, pixels, background_color)
+    return document
+
+
+def apply_operation(document: CanvasDocument, operation: Operation, options: BatchOptions) -> None:
+    name, args = operation.name, operation.args
+    if name in ("fill", "global-fill"):
+        col, row, color = args
+        if not document.contains(col, row):
+            raise ValueError(BATCH_OUT_OF_BOUNDS_FMT.format(col=col, row=row))
+        fill = document.flood_fill if name == "fill" else document.global_fill
+        fill(col, row, color, options.tolerance)
+    elif name == "replace-background":
+        document.replace_background(args[0])
+    elif name == "shift":
+        document.shift_by(args[0], args[1], document.background_color, options.wrap)
+    elif name in ("scale", "resize"):
+        columns, rows = (document.columns * args[0], document.rows * args[0]) if name == "scale" else args
+        bitmap = scaled((document.columns, document.rows, document.pixels), columns, rows)
+        document.load_pixels(*bitmap, document.background_color)
+
+
+def read_bitmap(path: str) -> Bitmap:
+    if infer_image_format(path) == IMAGE_FORMAT_PNG:
+        return read_png(path)
+
+    from PySide6.QtGui import QImage
+
+    from utils.qt_image import image_to_pixels
+
+    image = QImage(path)
+    if image.isNull():
+        raise ValueError(BATCH_READ_ERROR_FMT.format(path=path))
+    return image.width(), image.height(), image_to_pixels(image)
+
+
+def write_bitmap(path: str, bitmap: Bitmap, output_format: str) -> None:
+    if output_format == IMAGE_FORMAT_PNG:
+        write_png(path, bitmap)
+        return
+
+    from utils.image_io import export_image
+    from utils.qt_image import image_from_pixels
+
+    if output_format == IMAGE_FORMAT_JPEG:
+        bitmap = flattened(bitmap, parse_color(COLOR_WHITE))
+    if not export_image(image_from_pixels(*bitmap), path, output_format, True):
+        raise OSError(BATCH_WRITE_ERROR_FMT.format(path=path))
+
+
+def report(results: Iterator[BatchResult], total: int, stream: TextIO) -> int:
+    """Print a line per finished file, then every failure; return the process exit status."""
+    started = time.perf_counter()
+    failures = []
+    for done, result in enumerate(results, start=1):
+        if result.error is None:
+            line = BATCH_PROGRESS_FMT.format(
+                done=done, total=total, source=result.source, destination=result.destination,
+                milliseconds=result.seconds * 1000,
+            )
+        else:
+            failures.append(result)
+            line = BATCH_FAILED_FMT.format(done=done, total=total, source=result.source, error=result.error)
+        print(line, file=stream, flush=True)
+
+    print(BATCH_SUMMARY_FMT.format(
+        succeeded=total - len(failures), total=total, seconds=time.perf_counter() - started,
+    ), file=stream)
+    if not failures:
+        return 0
+
+    print(BATCH_FAILURES_HEADER, file=sys.stderr)
+    for result in sorted(failures, key=lambda failure: failure.source):
+        print(BATCH_FAILURE_FMT.format(source=result.source, error=result.error), file=sys.stderr)
+    return 1
+
+
+class _AppendOperation(argparse.Action):
+    """Append an ``Operation`` to the shared list, converting each value with the matching ``const`` entry."""
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: str | Sequence[object] | None,
+        option_string: str | None = None,
+    ) -> None:
+        converters: tuple[Callable[[str], int], ...] = self.const
+        try:
+            args = tuple(convert(str(value)) for convert, value in zip(converters, values or ()))
+        except (ValueError, argparse.ArgumentTypeError) as error:
+            raise argparse.ArgumentError(self, str(error)) from None
+        operations = list(getattr(namespace, self.dest) or ())
+        operations.append(Operation(self.option_strings[0].removeprefix("--"), args))
+        setattr(namespace, self.dest, operations)
+
+
+def _add_operation(
+    group: argparse._ArgumentGroup,
+    flag: str,
+    converters: tuple[Callable[[str], int], ...],
+    metavar: tuple[str, ...],
+    help_text: str,
+) -> None:
+    group.add_argument(
+        flag, dest="operations", action=_AppendOperation, nargs=len(converters), const=converters,
+        metavar=metavar, help=help_text,
+    )
+
+
+def _color(text: str) -> int:
+    try:
+        return parse_color(text)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def _tolerance(text: str) -> int:
+    value = int(text)
+    if not 0 <= value <= MAX_TOLERANCE:
+        raise argparse.ArgumentTypeError(BATCH_TOLERANCE_RANGE_FMT.format(maximum=MAX_TOLERANCE, value=text))
+    return value
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(BATCH_NOT_POSITIVE_FMT.format(value=text))
+    return value
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Compare the scanline flood fill against the previous per-pixel implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.flood_fill --size 512
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from core.document import CanvasDocument
+
+OPEN = 0xFFFFFFFF
+WALL = 0xFF000000
+FILL = 0xFFFF0000
+
+
+def open_canvas(size: int) -> list[int]:
+    return [OPEN] * (size * size)
+
+
+def spiral(size: int) -> list[int]:
+    pixels = open_canvas(size)
+    for inset in range(0, size // 2, 2):
+        last = size - 1 - inset
+        for offset in range(inset, last + 1):
+            for col, row in ((offset, inset), (offset, last), (inset, offset), (last, offset)):
+                pixels[row * size + col] = WALL
+        if inset > 0 and inset + 1 <= last:
+            gap_row = inset + 1 if (inset // 2) % 2 else last - 1
+            pixels[gap_row * size + inset] = OPEN
+    return pixels
+
+
+def checkerboard(size: int) -> list[int]:
+    pixels = open_canvas(size)
+    for row in range(1, size, 2):
+        for col in range(1, size, 2):
+            pixels[row * size + col] = WALL
+    return pixels
+
+
+SHAPES: dict[str, tuple[Callable[[int], list[int]], int]] = {
+    "open canvas": (open_canvas, 0),
+    "spiral": (spiral, 1),
+    "checkerboard": (checkerboard, 0),
+}
+
+
+def legacy_flood_fill(pixels: list[int], size: int, start_col: int, start_row: int, new_color: int) -> bool:
+    def contains(col: int, row: int) -> bool:
+        return 0 <= col < size and 0 <= row < size
+
+    target_color = pixels[start_row * size + start_col]
+    if target_color == new_color:
+        return False
+
+    stack = [(start_col, start_row)]
+    while stack:
+        col, row = stack.pop()
+        if contains(col, row) and pixels[row * size + col] == target_color:
+            pixels[row * size + col] = new_color
+            stack.extend([(col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)])
+    return True
+
+
+def run(size: int, repeat: int) -> None:
+    print(f"{'shape':<14}{'legacy ms':>12}{'scanline ms':>14}{'speedup':>10}")
+    for name, (build, start) in SHAPES.items():
+        source = build(size)
+        legacy_times: list[float] = []
+        scanline_times: list[float] = []
+        for _ in range(repeat):
+            legacy_pixels = list(source)
+            began = time.perf_counter()
+            legacy_flood_fill(legacy_pixels, size, start, start, FILL)
+            legacy_times.append(time.perf_counter() - began)
+
+            document = CanvasDocument(size, size, OPEN, history_limit=1, tile_size=16)
+            document.load_pixels(size, size, source, OPEN)
+            began = time.perf_counter()
+            document.flood_fill(start, start, FILL)
+            scanline_times.append(time.perf_counter() - began)
+
+            if list(document.pixels) != legacy_pixels:
+                raise SystemExit(f"{name}: scanline result differs from the legacy fill")
+
+        legacy_ms = min(legacy_times) * 1000
+        scanline_ms = min(scanline_times) * 1000
+        print(f"{name:<14}{legacy_ms:>12.1f}{scanline_ms:>14.1f}{legacy_ms / scanline_ms:>9.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=512, help="canvas width and height in pixels")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per shape; the fastest is reported")
+    args = parser.parse_args()
+    run(args.size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Blending of ARGB32 pixels and tiles for the layer stack."""
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Literal
+
+from core.pixel_buffer import PIXEL_BYTES, PIXEL_TYPECODE, PixelBuffer, copy_buffer, filled_buffer, masked_copy
+from core.tiles import Tile
+
+BlendMode = Literal["normal", "multiply", "screen", "darken", "lighten"]
+BLEND_MODES: tuple[BlendMode, ...] = ("normal", "multiply", "screen", "darken", "lighten")
+OPAQUE = 255
+
+_ALPHA_OFFSET = PIXEL_BYTES - 1 if sys.byteorder == "little" else 0
+_OPAQUE_TABLE = bytes(255) + b"\x01"
+_TRANSLUCENT_TABLE = b"\x00" + b"\x01" * 254 + b"\x00"
+_BLEND_CACHE_SIZE = 1 << 16
+_BLENDER_CACHE_SIZE = 8
+
+
+def blend_pixel(lower: int, upper: int, mode: BlendMode, opacity: int = OPAQUE) -> int:
+    """Composite ``upper`` over ``lower`` with the separable blend formulas of the W3C compositing spec."""
+    source_alpha = ((upper >> 24) * opacity + 127) // 255
+    if source_alpha == 0:
+        return lower
+
+    lower_alpha = lower >> 24
+    out_alpha = source_alpha + (lower_alpha * (255 - source_alpha) + 127) // 255
+    channels = 0
+    for shift in (16, 8, 0):
+        source = (upper >> shift) & 0xFF
+        backdrop = (lower >> shift) & 0xFF
+        mixed = (255 - lower_alpha) * source + lower_alpha * _blend_channel(mode, backdrop, source)
+        value = (source_alpha * mixed + lower_alpha * (255 - source_alpha) * backdrop) / (255 * out_alpha)
+        channels |= min(255, round(value)) << shift
+    return (out_alpha << 24) | channels
+
+
+def blend_tiles(lower: Tile, upper: Tile, size: int, mode: BlendMode, opacity: int = OPAQUE) -> Tile:
+    """Composite tile ``upper`` over tile ``lower``; both cover ``size`` pixels."""
+    if isinstance(upper, int):
+        if (upper >> 24) * opacity == 0:
+            return lower
+        if isinstance(lower, int):
+            return blend_pixel(lower, upper, mode, opacity)
+
+    lower_pixels = filled_buffer(lower, size) if isinstance(lower, int) else lower
+    upper_pixels = filled_buffer(upper, size) if isinstance(upper, int) else upper
+    if mode != "normal" or opacity != OPAQUE:
+        blend = _pixel_blender(mode, opacity)
+        return PixelBuffer(PIXEL_TYPECODE, map(blend, lower_pixels, upper_pixels))
+
+    alpha = upper_pixels.tobytes()[_ALPHA_OFFSET::PIXEL_BYTES]
+    opaque_mask = alpha.translate(_OPAQUE_TABLE)
+    if 0 not in opaque_mask:
+        return upper
+    if 1 not in opaque_mask and not alpha.strip(b"\x00"):
+        return lower
+
+    result = copy_buffer(lower_pixels)
+    masked_copy(result, upper_pixels, opaque_mask)
+    translucent_mask = alpha.translate(_TRANSLUCENT_TABLE)
+    blend = _pixel_blender(mode, opacity)
+    index = translucent_mask.find(1)
+    while index != -1:
+        result[index] = blend(lower_pixels[index], upper_pixels[index])
+        index = translucent_mask.find(1, index + 1)
+    return result
+
+
+@lru_cache(maxsize=_BLENDER_CACHE_SIZE)
+def _pixel_blender(mode: BlendMode, opacity: int) -> Callable[[int, int], int]:
+    """Return a memoized ``(lower, upper)`` blend; pixel art repeats the same colour pairs across a tile."""
+
+    @lru_cache(maxsize=_BLEND_CACHE_SIZE)
+    def blend(lower: int, upper: int) -> int:
+        return blend_pixel(lower, upper, mode, opacity)
+
+    return blend
+
+
+def _blend_channel(mode: BlendMode, backdrop: int, source: int) -> int:
+    if mode == "multiply":
+        return backdrop * source // 255
+    if mode == "screen":
+        return backdrop + source - backdrop * source // 255
+    if mode == "darken":
+        return min(backdrop, source)
+    if mode == "lighten":
+        return max(backdrop, source)
+    return source
@@ -0,0 +1,21 @@
+"""Payload describing one coalesced batch of canvas edits."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+from core.dirty import DirtyRect
+
+ChangeKind = Literal[
+    "stroke", "fill", "shape", "shift", "clear", "background", "layers", "undo", "redo", "reset", "load"
+]
+
+
+@dataclass(frozen=True)
+class ImageChange:
+    kinds: frozenset[ChangeKind]
+    region: tuple[DirtyRect, ...]
+
+    @property
+    def replaces_canvas(self) -> bool:
+        return bool(self.kinds & {"reset", "load"})
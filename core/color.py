@@ -0,0 +1,38 @@
+"""Conversions between ARGB32 colour values and text."""
+from __future__ import annotations
+
+from functools import lru_cache
+
+NAMED_COLORS = {
+    "transparent": 0x00000000,
+    "black": 0xFF000000,
+    "white": 0xFFFFFFFF,
+    "red": 0xFFFF0000,
+    "green": 0xFF008000,
+    "blue": 0xFF0000FF,
+}
+
+
+@lru_cache(maxsize=256)
+def color_hex(value: int) -> str:
+    """Format a value as ``#aarrggbb``, like ``QColor.name(QColor.NameFormat.HexArgb)``."""
+    return f"#{value:08x}"
+
+
+def parse_color(text: str) -> int:
+    """Parse ``#rgb``, ``#rrggbb``, ``#aarrggbb`` or one of ``NAMED_COLORS`` into an ARGB32 value."""
+    name = text.strip().lower()
+    if name in NAMED_COLORS:
+        return NAMED_COLORS[name]
+
+    digits = name.removeprefix("#")
+    if len(digits) == 3:
+        digits = "".join(digit * 2 for digit in digits)
+    if len(digits) == 6:
+        digits = "ff" + digits
+    if len(digits) != 8 or not name.startswith("#"):
+        raise ValueError(f"Invalid color: {text!r}")
+    try:
+        return int(digits, 16)
+    except ValueError:
+        raise ValueError(f"Invalid color: {text!r}") from None
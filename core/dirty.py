@@ -0,0 +1,62 @@
+"""Accumulates the rectangles touched by document edits."""
+from __future__ import annotations
+
+DirtyRect = tuple[int, int, int, int]
+
+# Two rectangles are merged when their union wastes at most this many untouched pixels.
+MERGE_SLACK = 64
+MAX_RECTS = 16
+
+
+class DirtyRegion:
+    def __init__(self) -> None:
+        self._rects: list[tuple[int, int, int, int]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._rects)
+
+    def add(self, left: int, top: int, right: int, bottom: int) -> None:
+        if right < left or bottom < top:
+            return
+
+        rect = (left, top, right, bottom)
+        merged = True
+        while merged:
+            merged = False
+            for index, other in enumerate(self._rects):
+                union = _union(rect, other)
+                if _area(union) <= _area(rect) + _area(other) + MERGE_SLACK:
+                    del self._rects[index]
+                    rect = union
+                    merged = True
+                    break
+
+        self._rects.append(rect)
+        if len(self._rects) > MAX_RECTS:
+            self._rects = [self.bounds()]
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        left = min(rect[0] for rect in self._rects)
+        top = min(rect[1] for rect in self._rects)
+        right = max(rect[2] for rect in self._rects)
+        bottom = max(rect[3] for rect in self._rects)
+        return left, top, right, bottom
+
+    def take(self) -> list[DirtyRect]:
+        """Return the accumulated ``(left, top, width, height)`` rectangles and reset the region."""
+        rects = [(left, top, right - left + 1, bottom - top + 1) for left, top, right, bottom in self._rects]
+        self._rects.clear()
+        return rects
+
+
+def _union(first: tuple[int, int, int, int], second: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+    return (
+        min(first[0], second[0]),
+        min(first[1], second[1]),
+        max(first[2], second[2]),
+        max(first[3], second[3]),
+    )
+
+
+def _area(rect: tuple[int, int, int, int]) -> int:
+    return (rect[2] - rect[0] + 1) * (rect[3] - rect[1] + 1)
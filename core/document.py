@@ -1,14 +1,44 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
-from math import cos, pi, sin
-from typing import Literal
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import Concatenate, ParamSpec, TypeVar
+
+from core.dirty import DirtyRect, DirtyRegion
+from core.history import EditGroup, HistoryEntry, LayerStackEntry, MaskEntry, UndoEntry
+from core.layers import DEFAULT_LAYER_NAME, Layer, LayerComposite, LayerSettings, LayerStack, LayerStackState
+from core.pixel_buffer import PIXEL_TYPECODE, TRANSPARENT_COLOR, PixelBuffer, fill_spans, filled_buffer
+from core.pyramid import PixelPyramid, PyramidLevel
+from core.raster import ShapeBounds, ShapeKind, line_points, shape_spans
+from core.tiles import TiledPixels
 
 ColorValue = int
-PixelSnapshot = tuple[ColorValue, ...]
-ShapeKind = Literal["rect", "ellipse"]
-ShapeBounds = tuple[int, int, int, int]
-TRANSPARENT_COLOR: ColorValue = 0
+PixelSnapshot = PixelBuffer
+EditParams = ParamSpec("EditParams")
+EditResult = TypeVar("EditResult")
+
+
+@dataclass(frozen=True)
+class ShapePreview:
+    bounds: ShapeBounds
+    pixels: PixelBuffer
+
+
+def _undoable(
+    method: Callable[Concatenate[CanvasDocument, EditParams], EditResult],
+) -> Callable[Concatenate[CanvasDocument, EditParams], EditResult]:
+    """Make a pixel edit its own undo step unless a transaction or history entry is already recording it."""
+
+    @wraps(method)
+    def edit(document: CanvasDocument, *args: EditParams.args, **kwargs: EditParams.kwargs) -> EditResult:
+        if document.in_transaction or document._active_entry is not None:
+            return method(document, *args, **kwargs)
+        with document.transaction(method.__name__):
+            return method(document, *args, **kwargs)
+
+    return edit
 
 
 class CanvasDocument:
@@ -20,20 +50,42 @@ class CanvasDocument:
         *,
         history_limit: int,
         tile_size: int,
+        history_budget: int | None = None,
     ) -> None:
         self.history_limit = history_limit
+        self.history_budget = history_budget
         self.tile_size = tile_size
         self.background_color = background_color
         self.columns = 0
         self.rows = 0
-        self._pixels: list[ColorValue] = []
-        self._undo_stack: list[PixelSnapshot] = []
-        self._redo_stack: list[PixelSnapshot] = []
+        self._stack = _single_layer_stack(TiledPixels(0, 0, background_color))
+        self._composite = LayerComposite()
+        self._undo_stack: list[UndoEntry] = []
+        self._redo_stack: list[UndoEntry] = []
+        self._active_entry: HistoryEntry | None = None
+        self._transaction: EditGroup | None = None
+        self._transaction_depth = 0
+        self._transaction_background = background_color
+        self._dirty_region = DirtyRegion()
+        self._pyramid = PixelPyramid()
         self.reset(columns, rows, background_color, clear_history=True)
+        self._dirty_region = DirtyRegion()
 
     @property
     def pixels(self) -> PixelSnapshot:
-        return tuple(self._pixels)
+        return self._composited().to_buffer()
+
+    @property
+    def layers(self) -> tuple[LayerSettings, ...]:
+        return tuple(layer.settings for layer in self._stack.layers)
+
+    @property
+    def active_layer_index(self) -> int:
+        return self._stack.active_index
+
+    @property
+    def _pixels(self) -> TiledPixels:
+        return self._stack.active.pixels
 
     def reset(
         self,
@@ -44,16 +96,23 @@ class CanvasDocument:
         clear_history: bool = False,
         tile_size: int = 0,
     ) -> None:
+        if clear_history or (columns, rows) != (self.columns, self.rows):
+            self.clear_history()
+            before = None
+        else:
+            self._seal_active_entry()
+            before = self._stack.snapshot()
+
         self.columns = columns
         self.rows = rows
         if tile_size:
             self.tile_size = tile_size
 
         self.background_color = background_color
-        self._pixels = [background_color] * (columns * rows)
-
-        if clear_history:
-            self.clear_history()
+        self._stack = _single_layer_stack(TiledPixels(columns, rows, background_color))
+        if before is not None:
+            self.commit_history_entry(LayerStackEntry(before, self._stack.snapshot(), (0, 0, columns, rows)))
+        self._mark_canvas_dirty()
 
     def load_pixels(
         self,
@@ -69,12 +128,16 @@ class CanvasDocument:
         self.clear_history()
         self.columns = columns
         self.rows = rows
-        self._pixels = list(pixels)
+        self._stack = _single_layer_stack(TiledPixels.from_buffer(columns, rows, PixelBuffer(PIXEL_TYPECODE, pixels)))
         self.background_color = background_color
+        self._mark_canvas_dirty()
 
     def clear_history(self) -> None:
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._active_entry = None
+        self._transaction = None
+        self._transaction_depth = 0
 
     @property
     def can_undo(self) -> bool:
@@ -84,52 +147,212 @@ class CanvasDocument:
     def can_redo(self) -> bool:
         return bool(self._redo_stack)
 
-    def create_snapshot(self) -> PixelSnapshot:
-        return tuple(self._pixels)
+    @property
+    def history_memory_usage(self) -> int:
+        return sum(entry.nbytes for entry in self._undo_stack + self._redo_stack)
+
+    def take_dirty_region(self) -> list[DirtyRect]:
+        """Return the ``(left, top, width, height)`` rectangles changed since the last call."""
+        return self._dirty_region.take()
+
+    def reduced_pixels(self, min_columns: int, min_rows: int) -> PyramidLevel | None:
+        """Return the smallest pyramid reduction at least ``min_columns`` x ``min_rows``, or None for full size."""
+        return self._pyramid.level(self._composited(), min_columns, min_rows)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction is not None
+
+    @contextmanager
+    def transaction(self, label: str) -> Iterator[EditGroup]:
+        """Group every edit made inside the block into one undo step; an exception rolls them back."""
+        group = self.begin_transaction(label)
+        try:
+            yield group
+        except BaseException:
+            self.abort_transaction()
+            raise
+        self.end_transaction()
+
+    def begin_transaction(self, label: str) -> EditGroup:
+        """Start grouping edits until the matching ``end_transaction``; nested calls join the open group."""
+        if self._transaction is None:
+            self._seal_active_entry()
+            self._transaction = EditGroup(label)
+            self._transaction_background = self.background_color
+        self._transaction_depth += 1
+        return self._transaction
+
+    def end_transaction(self) -> bool:
+        """Close the innermost transaction and return whether the outermost one committed an undo step."""
+        group = self._transaction
+        if group is None:
+            return False
+
+        self._transaction_depth -= 1
+        if self._transaction_depth:
+            return False
+
+        self._seal_active_entry()
+        self._transaction = None
+        group.seal()
+        if group.is_empty:
+            return False
+
+        self.commit_history_entry(group)
+        return True
+
+    def abort_transaction(self) -> None:
+        """Revert and discard every edit of the open transaction, nested ones included."""
+        group = self._transaction
+        if group is None:
+            return
+
+        self._seal_active_entry()
+        self._transaction = None
+        self._transaction_depth = 0
+        group.seal()
+        group.apply_before(self._stack)
+        self.background_color = self._transaction_background
+        if group.bounds is not None:
+            self._mark_dirty(*_rect_corners(group.bounds))
+
+    def begin_history_entry(self) -> HistoryEntry:
+        self._seal_active_entry()
+        self._active_entry = HistoryEntry()
+        return self._active_entry
+
+    def commit_history_entry(self, entry: UndoEntry) -> None:
+        if self._transaction is not None:
+            self._transaction.add(entry)
+            return
 
-    def commit_snapshot(self, snapshot: PixelSnapshot) -> None:
-        self._undo_stack.append(snapshot)
+        self._undo_stack.append(entry)
         if len(self._undo_stack) > self.history_limit:
             self._undo_stack.pop(0)
         self._redo_stack.clear()
+        self._compact_history()
 
     def clear(self, background_color: ColorValue) -> bool:
-        self.commit_snapshot(self.create_snapshot())
-        self.background_color = background_color
-        self._pixels = [background_color] * (self.columns * self.rows)
+        with self.transaction("clear"):
+            self._record_canvas()
+            layer = self._stack.active
+            if layer is self._stack.layers[0]:
+                self.background_color = background_color
+            layer.pixels.fill(self._layer_base_color(layer))
         return True
 
+    @_undoable
     def draw_pixel(self, col: int, row: int, color: ColorValue) -> bool:
         if not self.contains(col, row):
             return False
 
-        index = self._pixel_index(col, row)
-        if self._pixels[index] == color:
+        if self._pixels.pixel(col, row) == color:
             return False
 
-        self._pixels[index] = color
+        self._record_rect(col, row, col, row)
+        self._pixels.set_pixel(col, row, color)
         return True
 
+    @_undoable
+    def draw_pixels(self, points: Iterable[tuple[int, int]], color: ColorValue) -> bool:
+        pixels = self._pixels
+        changed = [
+            (col, row) for col, row in points
+            if self.contains(col, row) and pixels.pixel(col, row) != color
+        ]
+        if not changed:
+            return False
+
+        cols = [col for col, _ in changed]
+        rows = [row for _, row in changed]
+        self._record_rect(min(cols), min(rows), max(cols), max(rows))
+        for col, row in changed:
+            pixels.set_pixel(col, row, color)
+        return True
+
+    def draw_line(self, start_col: int, start_row: int, end_col: int, end_row: int, color: ColorValue) -> bool:
+        return self.draw_pixels(line_points(start_col, start_row, end_col, end_row), color)
+
     def pixel_color(self, col: int, row: int) -> ColorValue:
         if not self.contains(col, row):
             return TRANSPARENT_COLOR
-        return self._pixels[self._pixel_index(col, row)]
+        return self._composited().pixel(col, row)
+
+    def region_pixels(self, left: int, top: int, width: int, height: int) -> PixelBuffer:
+        return self._composited().read_rect(left, top, width, height)
 
-    def flood_fill(self, start_col: int, start_row: int, new_color: ColorValue) -> bool:
+    @_undoable
+    def flood_fill(self, start_col: int, start_row: int, new_color: ColorValue, tolerance: int = 0) -> bool:
         if not self.contains(start_col, start_row):
             return False
 
-        target_color = self.pixel_color(start_col, start_row)
-        if target_color == new_color:
+        target_color = self._pixels.pixel(start_col, start_row)
+        if target_color == new_color and tolerance == 0:
             return False
 
-        stack = [(start_col, start_row)]
-        while stack:
-            col, row = stack.pop()
-            if self.contains(col, row) and self.pixel_color(col, row) == target_color:
-                self._pixels[self._pixel_index(col, row)] = new_color
-                stack.extend([(col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)])
+        columns = self.columns
+        rows = self.rows
+        layer = self._stack.active
+        pixels = layer.pixels
+        entry = self._recording_entry()
+        row_masks: list[bytearray | None] = [None] * rows
+        changed = False
+        dirty_left, dirty_right = columns, -1
+        dirty_top, dirty_bottom = start_row, start_row
+        seeds = [(start_col, start_row)]
+        while seeds:
+            col, row = seeds.pop()
+            mask = row_masks[row] or self._fill_mask(row_masks, row, target_color, tolerance)
+            if not mask[col]:
+                continue
+
+            left = mask.rfind(0, 0, col) + 1
+            right = mask.find(0, col)
+            if right == -1:
+                right = columns
+            entry.record(layer, left, row, right - 1, row)
+            dirty_left = min(dirty_left, left)
+            dirty_right = max(dirty_right, right - 1)
+            dirty_top = min(dirty_top, row)
+            dirty_bottom = max(dirty_bottom, row)
+
+            if right - left == 1:
+                mask[left] = 0
+                changed = changed or pixels.pixel(left, row) != new_color
+                pixels.set_pixel(left, row, new_color)
+            else:
+                mask[left:right] = bytes(right - left)
+                changed = changed or pixels.read_row(row, left, right - 1).count(new_color) != right - left
+                pixels.fill_span(row, left, right - 1, new_color)
+
+            for next_row in (row - 1, row + 1):
+                if 0 <= next_row < rows:
+                    next_mask = row_masks[next_row] or self._fill_mask(row_masks, next_row, target_color, tolerance)
+                    seed = next_mask.find(1, left, right)
+                    while seed != -1:
+                        seeds.append((seed, next_row))
+                        gap = next_mask.find(0, seed, right)
+                        seed = -1 if gap == -1 else next_mask.find(1, gap, right)
+
+        if changed:
+            self._mark_dirty(dirty_left, dirty_top, dirty_right, dirty_bottom)
+        return changed
+
+    @_undoable
+    def global_fill(self, start_col: int, start_row: int, new_color: ColorValue, tolerance: int = 0) -> bool:
+        if not self.contains(start_col, start_row):
+            return False
+
+        target_color = self._pixels.pixel(start_col, start_row)
+        masks = self._pixels.match_tiles(target_color, tolerance, excluded=new_color)
+        bounds = self._pixels.tiles_bounds(masks)
+        if bounds is None:
+            return False
 
+        left, top, width, height = bounds
+        self._record_rect(left, top, left + width - 1, top + height - 1)
+        self._pixels.fill_masked(masks, new_color)
         return True
 
     def shift(
@@ -137,25 +360,28 @@ class CanvasDocument:
         direction: str,
         background_color: ColorValue,
         offsets: Mapping[str, tuple[int, int]],
+        distance: int = 1,
+        wrap: bool = False,
     ) -> bool:
         dx, dy = offsets.get(direction, (0, 0))
+        return self.shift_by(dx * distance, dy * distance, background_color, wrap)
+
+    def shift_by(self, dx: int, dy: int, background_color: ColorValue, wrap: bool = False) -> bool:
+        if wrap:
+            dx %= self.columns
+            dy %= self.rows
         if dx == 0 and dy == 0:
             return False
 
-        self.commit_snapshot(self.create_snapshot())
-
-        shifted_pixels = [background_color] * (self.columns * self.rows)
-        for row in range(self.rows):
-            for col in range(self.columns):
-                target_col = col + dx
-                target_row = row + dy
-                if self.contains(target_col, target_row):
-                    shifted_pixels[self._pixel_index(target_col, target_row)] = self.pixel_color(col, row)
-
-        self._pixels = shifted_pixels
-        self.background_color = background_color
+        with self.transaction("shift"):
+            self._record_canvas()
+            layer = self._stack.active
+            if layer is self._stack.layers[0]:
+                self.background_color = background_color
+            layer.pixels = layer.pixels.shifted(dx, dy, self._layer_base_color(layer), wrap)
         return True
 
+    @_undoable
     def draw_shape(
         self,
         shape_kind: ShapeKind,
@@ -165,12 +391,15 @@ class CanvasDocument:
         end_row: int,
         force_square: bool,
         color: ColorValue,
+        filled: bool = False,
     ) -> bool:
         bounds = self.shape_bounds(start_col, start_row, end_col, end_row, force_square)
         if bounds is None:
             return False
 
-        self._draw_shape(self._pixels, shape_kind, bounds, color)
+        left, top, width, height = bounds
+        self._record_rect(left, top, left + width - 1, top + height - 1)
+        self._pixels.fill_spans(shape_spans(shape_kind, bounds, filled), color)
         return True
 
     def create_shape_preview(
@@ -182,12 +411,16 @@ class CanvasDocument:
         end_row: int,
         force_square: bool,
         color: ColorValue,
-    ) -> PixelSnapshot:
-        preview_pixels = [TRANSPARENT_COLOR] * (self.columns * self.rows)
+        filled: bool = False,
+    ) -> ShapePreview | None:
         bounds = self.shape_bounds(start_col, start_row, end_col, end_row, force_square)
-        if bounds is not None:
-            self._draw_shape(preview_pixels, shape_kind, bounds, color)
-        return tuple(preview_pixels)
+        if bounds is None:
+            return None
+
+        left, top, width, height = bounds
+        preview_pixels = filled_buffer(TRANSPARENT_COLOR, width * height)
+        fill_spans(preview_pixels, width, shape_spans(shape_kind, bounds, filled), color, (left, top))
+        return ShapePreview(bounds, preview_pixels)
 
     def shape_bounds(
         self,
@@ -224,20 +457,74 @@ class CanvasDocument:
             return False
 
         previous_background_color = self.background_color
-        snapshot = self.create_snapshot()
-        changed = False
+        self.background_color = new_background_color
+        layer = self._stack.layers[0]
+        masks = layer.pixels.match_tiles(previous_background_color)
+        entry = MaskEntry(
+            layer, masks, layer.pixels.tiles_bounds(masks), previous_background_color, new_background_color
+        )
+        if entry.bounds is None:
+            return False
 
-        for index, pixel in enumerate(self._pixels):
-            if pixel == previous_background_color:
-                self._pixels[index] = new_background_color
-                changed = True
+        self._seal_active_entry()
+        self.commit_history_entry(entry)
+        layer.pixels.fill_masked(masks, new_background_color)
+        self._mark_dirty(*_rect_corners(entry.bounds))
+        return True
 
-        if not changed:
-            self.background_color = new_background_color
+    def set_active_layer(self, index: int) -> None:
+        self._seal_active_entry()
+        self._stack.active_index = index
+
+    def add_layer(self, name: str) -> None:
+        """Insert an empty layer above the active one and make it active."""
+        before = self._begin_layer_change()
+        index = self._stack.active_index + 1
+        pixels = TiledPixels(self.columns, self.rows, TRANSPARENT_COLOR)
+        self._stack.layers.insert(index, Layer(pixels, LayerSettings(name)))
+        self._stack.active_index = index
+        self._commit_layer_change(before, None)
+
+    def remove_layer(self, index: int) -> bool:
+        if len(self._stack.layers) == 1:
             return False
 
-        self.commit_snapshot(snapshot)
-        self.background_color = new_background_color
+        before = self._begin_layer_change()
+        layer = self._stack.layers.pop(index)
+        self._stack.active_index = min(self._stack.active_index, len(self._stack.layers) - 1)
+        self._commit_layer_change(before, layer.content_bounds())
+        return True
+
+    def move_layer(self, index: int, new_index: int) -> bool:
+        if index == new_index or not 0 <= new_index < len(self._stack.layers):
+            return False
+
+        before = self._begin_layer_change()
+        layer = self._stack.layers.pop(index)
+        self._stack.layers.insert(new_index, layer)
+        self._stack.active_index = new_index
+        self._commit_layer_change(before, layer.content_bounds())
+        return True
+
+    def set_layer_settings(self, index: int, settings: LayerSettings) -> bool:
+        """Apply ``settings`` to a layer; successive opacity changes of one layer share a single undo step."""
+        layer = self._stack.layers[index]
+        if settings == layer.settings:
+            return False
+
+        merge_key = (layer, "opacity") if replace(settings, opacity=layer.settings.opacity) == layer.settings else None
+        before = self._begin_layer_change()
+        layer.settings = settings
+        bounds = layer.content_bounds()
+        top_entry = self._undo_stack[-1] if self._undo_stack and self._transaction is None else None
+        if merge_key is not None and isinstance(top_entry, LayerStackEntry) and top_entry.merge_key == merge_key:
+            top_entry.after = self._stack.snapshot()
+            self._redo_stack.clear()
+            if bounds is not None:
+                self._mark_dirty(*_rect_corners(bounds))
+            return True
+
+        self._commit_layer_change(before, bounds, merge_key)
         return True
 
     def undo(self) -> bool:
@@ -249,59 +536,105 @@ class CanvasDocument:
     def contains(self, col: int, row: int) -> bool:
         return 0 <= col < self.columns and 0 <= row < self.rows
 
-    def _traverse_history(self, source_stack: list[PixelSnapshot], dest_stack: list[PixelSnapshot]) -> bool:
+    def _traverse_history(self, source_stack: list[UndoEntry], dest_stack: list[UndoEntry]) -> bool:
+        if self._transaction is not None:
+            raise RuntimeError("Cannot undo or redo while a transaction is open")
+
+        self._seal_active_entry()
         if not source_stack:
             return False
 
-        dest_stack.append(self.create_snapshot())
-        self._pixels = list(source_stack.pop())
+        entry = source_stack.pop()
+        if source_stack is self._undo_stack:
+            entry.apply_before(self._stack)
+        else:
+            entry.apply_after(self._stack)
+        if entry.bounds is not None:
+            self._mark_dirty(*_rect_corners(entry.bounds))
+        dest_stack.append(entry)
+        self._compact_history()
         return True
 
-    def _draw_shape(
+    def _fill_mask(
         self,
-        pixels: list[ColorValue],
-        shape_kind: ShapeKind,
-        bounds: ShapeBounds,
-        color: ColorValue,
-    ) -> None:
-        if shape_kind == "rect":
-            self._draw_rect(pixels, bounds, color)
-        else:
-            self._draw_ellipse(pixels, bounds, color)
+        row_masks: list[bytearray | None],
+        row: int,
+        target_color: ColorValue,
+        tolerance: int,
+    ) -> bytearray:
+        mask = bytearray(self._pixels.match_row(row, target_color, tolerance))
+        row_masks[row] = mask
+        return mask
+
+    def _seal_active_entry(self) -> None:
+        entry = self._active_entry
+        if entry is None:
+            return
 
-    def _draw_rect(self, pixels: list[ColorValue], bounds: ShapeBounds, color: ColorValue) -> None:
-        left, top, width, height = bounds
-        right = left + width - 1
-        bottom = top + height - 1
+        entry.seal()
+        self._active_entry = None
+        if entry.is_empty and self._undo_stack and self._undo_stack[-1] is entry:
+            self._undo_stack.pop()
+        self._compact_history()
 
-        for col in range(left, right + 1):
-            self._set_pixel(pixels, col, top, color)
-            self._set_pixel(pixels, col, bottom, color)
-        for row in range(top, bottom + 1):
-            self._set_pixel(pixels, left, row, color)
-            self._set_pixel(pixels, right, row, color)
+    def _compact_history(self) -> None:
+        for stack in (self._undo_stack, self._redo_stack):
+            for entry in stack[:-1]:
+                entry.compress()
 
-    def _draw_ellipse(self, pixels: list[ColorValue], bounds: ShapeBounds, color: ColorValue) -> None:
-        left, top, width, height = bounds
-        if width <= 2 or height <= 2:
-            self._draw_rect(pixels, bounds, color)
+        if self.history_budget is None:
             return
 
-        radius_x = (width - 1) / 2
-        radius_y = (height - 1) / 2
-        center_x = left + radius_x
-        center_y = top + radius_y
-        steps = max(12, int(2 * pi * max(radius_x, radius_y) * 2))
+        usage = self.history_memory_usage
+        while usage > self.history_budget and len(self._undo_stack) + len(self._redo_stack) > 1:
+            stack = self._redo_stack if len(self._undo_stack) <= 1 else self._undo_stack
+            usage -= stack.pop(0).nbytes
+
+    def _record_canvas(self) -> None:
+        self._record_rect(0, 0, self.columns - 1, self.rows - 1)
+
+    def _record_rect(self, left: int, top: int, right: int, bottom: int) -> None:
+        self._recording_entry().record(self._stack.active, left, top, right, bottom)
+        self._mark_dirty(left, top, right, bottom)
+
+    def _recording_entry(self) -> HistoryEntry:
+        entry = self._active_entry
+        if entry is None:
+            entry = self.begin_history_entry()
+            self.commit_history_entry(entry)
+        return entry
+
+    def _begin_layer_change(self) -> LayerStackState:
+        self._seal_active_entry()
+        return self._stack.snapshot()
+
+    def _commit_layer_change(self, before: LayerStackState, bounds: DirtyRect | None, merge_key: object = None) -> None:
+        self.commit_history_entry(LayerStackEntry(before, self._stack.snapshot(), bounds, merge_key))
+        if bounds is not None:
+            self._mark_dirty(*_rect_corners(bounds))
+
+    def _layer_base_color(self, layer: Layer) -> ColorValue:
+        return self.background_color if layer is self._stack.layers[0] else TRANSPARENT_COLOR
+
+    def _composited(self) -> TiledPixels:
+        return self._composite.pixels(self._stack.layers)
+
+    def _mark_dirty(self, left: int, top: int, right: int, bottom: int) -> None:
+        self._dirty_region.add(left, top, right, bottom)
+        self._pyramid.invalidate(left, top, right, bottom)
+        self._composite.invalidate(left, top, right, bottom)
+
+    def _mark_canvas_dirty(self) -> None:
+        self._dirty_region = DirtyRegion()
+        self._dirty_region.add(0, 0, self.columns - 1, self.rows - 1)
+        self._pyramid.reset()
+        self._composite.reset()
+
 
-        for step in range(steps):
-            angle = 2 * pi * step / steps
-            col = round(center_x + radius_x * cos(angle))
-            row = round(center_y + radius_y * sin(angle))
-            self._set_pixel(pixels, col, row, color)
+def _single_layer_stack(pixels: TiledPixels) -> LayerStack:
+    return LayerStack([Layer(pixels, LayerSettings(DEFAULT_LAYER_NAME))])
 
-    def _set_pixel(self, pixels: list[ColorValue], col: int, row: int, color: ColorValue) -> None:
-        if self.contains(col, row):
-            pixels[self._pixel_index(col, row)] = color
 
-    def _pixel_index(self, col: int, row: int) -> int:
-        return row * self.columns + col
+def _rect_corners(rect: DirtyRect) -> tuple[int, int, int, int]:
+    left, top, width, height = rect
+    return left, top, left + width - 1, top + height - 1
@@ -0,0 +1,301 @@
+"""Undo/redo entries that share tiles with the document's layers, store colour-swap masks, restack layers
+or group other entries into one step."""
+from __future__ import annotations
+
+import zlib
+
+from core.layers import Layer, LayerStack, LayerStackState
+from core.pixel_buffer import PIXEL_BYTES, buffer_from_bytes
+from core.tiles import Tile, TileMasks
+
+PatchBounds = tuple[int, int, int, int]
+COMPRESSION_LEVEL = 1
+
+StoredTile = Tile | bytes
+TileKey = tuple[Layer, int]
+
+
+class HistoryEntry:
+    """Before/after tiles touched by one undoable edit, keyed by layer and tile index.
+
+    While open, it keeps a reference to every tile the document is about to
+    write to; the document copies shared tiles before writing, so references
+    cost nothing until the tile changes. Sealing adds references to the
+    resulting tiles and drops the ones that were never written. Sealed entries
+    can be zlib-compressed tile by tile and are only inflated again while being
+    applied.
+    """
+
+    def __init__(self) -> None:
+        self.bounds: PatchBounds | None = None
+        self._before: dict[TileKey, StoredTile] = {}
+        self._after: dict[TileKey, StoredTile] | None = None
+        self._is_compressed = False
+        self._left = -1
+        self._right = -1
+        self._top = -1
+        self._bottom = -1
+
+    @property
+    def is_sealed(self) -> bool:
+        return self._after is not None
+
+    @property
+    def is_compressed(self) -> bool:
+        return self._is_compressed
+
+    @property
+    def nbytes(self) -> int:
+        tiles = list(self._before.values()) + list((self._after or {}).values())
+        return sum(_stored_nbytes(tile) for tile in tiles)
+
+    @property
+    def is_empty(self) -> bool:
+        return self._right < 0
+
+    def record(self, layer: Layer, left: int, top: int, right: int, bottom: int) -> None:
+        for index in layer.pixels.tiles_in_rect(left, top, right, bottom):
+            if (layer, index) not in self._before:
+                self._before[layer, index] = layer.pixels.share_tile(index)
+
+        if self.is_empty:
+            self._left, self._top, self._right, self._bottom = left, top, right, bottom
+            return
+
+        self._left = min(self._left, left)
+        self._top = min(self._top, top)
+        self._right = max(self._right, right)
+        self._bottom = max(self._bottom, bottom)
+
+    def seal(self) -> None:
+        if self.is_sealed:
+            return
+
+        after: dict[TileKey, StoredTile] = {}
+        for (layer, index), before in list(self._before.items()):
+            layer.pixels.compact_tile(index)
+            tile = layer.pixels.share_tile(index)
+            if tile is before or tile == before:
+                del self._before[layer, index]
+            else:
+                after[layer, index] = tile
+        if not self.is_empty:
+            self.bounds = (self._left, self._top, self._right - self._left + 1, self._bottom - self._top + 1)
+        self._after = after
+
+    def compress(self) -> None:
+        if self._after is None or self._is_compressed:
+            return
+
+        self._before = {key: _compress_tile(tile) for key, tile in self._before.items()}
+        self._after = {key: _compress_tile(tile) for key, tile in self._after.items()}
+        self._is_compressed = True
+
+    def apply_before(self, stack: LayerStack) -> None:
+        self._apply(self._before)
+
+    def apply_after(self, stack: LayerStack) -> None:
+        self._apply(self._after or {})
+
+    def _apply(self, tiles: dict[TileKey, StoredTile]) -> None:
+        for (layer, index), tile in tiles.items():
+            if isinstance(tile, bytes):
+                layer.pixels.put_tile(index, buffer_from_bytes(zlib.decompress(tile)), owned=True)
+            else:
+                layer.pixels.put_tile(index, tile)
+
+
+class MaskEntry:
+    """A colour swap on one layer stored as per-tile masks of the replaced pixels.
+
+    Undo and redo refill the masked pixels with the old or new colour, so the
+    entry never holds pixel data.
+    """
+
+    def __init__(
+        self,
+        layer: Layer,
+        masks: TileMasks,
+        bounds: PatchBounds | None,
+        before_color: int,
+        after_color: int,
+    ) -> None:
+        self.layer = layer
+        self.bounds = bounds
+        self.before_color = before_color
+        self.after_color = after_color
+        self._masks = masks
+        self._compressed: dict[int, bytes | None] | None = None
+
+    @property
+    def is_sealed(self) -> bool:
+        return True
+
+    @property
+    def is_compressed(self) -> bool:
+        return self._compressed is not None
+
+    @property
+    def nbytes(self) -> int:
+        masks = self._masks if self._compressed is None else self._compressed
+        return sum(len(mask) for mask in masks.values() if mask is not None)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.bounds is None
+
+    def seal(self) -> None:
+        pass
+
+    def compress(self) -> None:
+        if self._compressed is not None:
+            return
+
+        self._compressed = {
+            index: None if mask is None else zlib.compress(mask, COMPRESSION_LEVEL)
+            for index, mask in self._masks.items()
+        }
+        self._masks = {}
+
+    def apply_before(self, stack: LayerStack) -> None:
+        self.layer.pixels.fill_masked(self._current_masks(), self.before_color)
+
+    def apply_after(self, stack: LayerStack) -> None:
+        self.layer.pixels.fill_masked(self._current_masks(), self.after_color)
+
+    def _current_masks(self) -> TileMasks:
+        if self._compressed is None:
+            return self._masks
+        return {
+            index: None if mask is None else zlib.decompress(mask)
+            for index, mask in self._compressed.items()
+        }
+
+
+class LayerStackEntry:
+    """Layers added, removed, reordered or reconfigured, stored as references to the layers themselves.
+
+    ``bounds`` covers the pixels whose composite changes. Consecutive edits that
+    share a ``merge_key``, such as dragging a layer's opacity, collapse into one entry.
+    """
+
+    def __init__(
+        self,
+        before: LayerStackState,
+        after: LayerStackState,
+        bounds: PatchBounds | None,
+        merge_key: object = None,
+    ) -> None:
+        self.before = before
+        self.after = after
+        self.bounds = bounds
+        self.merge_key = merge_key
+
+    @property
+    def is_sealed(self) -> bool:
+        return True
+
+    @property
+    def is_compressed(self) -> bool:
+        return False
+
+    @property
+    def nbytes(self) -> int:
+        before_layers = {layer for layer, _ in self.before[0]}
+        after_layers = {layer for layer, _ in self.after[0]}
+        return sum(layer.pixels.nbytes for layer in before_layers ^ after_layers)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.before == self.after
+
+    def seal(self) -> None:
+        pass
+
+    def compress(self) -> None:
+        pass
+
+    def apply_before(self, stack: LayerStack) -> None:
+        stack.restore(self.before)
+
+    def apply_after(self, stack: LayerStack) -> None:
+        stack.restore(self.after)
+
+
+class EditGroup:
+    """Entries committed inside one transaction, undone and redone together as a single step."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.bounds: PatchBounds | None = None
+        self.entries: list[UndoEntry] = []
+        self._is_sealed = False
+
+    @property
+    def is_sealed(self) -> bool:
+        return self._is_sealed
+
+    @property
+    def is_compressed(self) -> bool:
+        return all(entry.is_compressed for entry in self.entries)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry.nbytes for entry in self.entries)
+
+    @property
+    def is_empty(self) -> bool:
+        return all(entry.is_empty for entry in self.entries)
+
+    def add(self, entry: UndoEntry) -> None:
+        if not self.entries or self.entries[-1] is not entry:
+            self.entries.append(entry)
+
+    def seal(self) -> None:
+        if self._is_sealed:
+            return
+
+        for entry in self.entries:
+            entry.seal()
+        self.entries = [entry for entry in self.entries if not entry.is_empty]
+        for entry in self.entries:
+            if entry.bounds is not None:
+                self.bounds = entry.bounds if self.bounds is None else _union_bounds(self.bounds, entry.bounds)
+        self._is_sealed = True
+
+    def compress(self) -> None:
+        for entry in self.entries:
+            entry.compress()
+
+    def apply_before(self, stack: LayerStack) -> None:
+        for entry in reversed(self.entries):
+            entry.apply_before(stack)
+
+    def apply_after(self, stack: LayerStack) -> None:
+        for entry in self.entries:
+            entry.apply_after(stack)
+
+
+UndoEntry = HistoryEntry | MaskEntry | LayerStackEntry | EditGroup
+
+
+def _compress_tile(tile: StoredTile) -> StoredTile:
+    if isinstance(tile, int | bytes):
+        return tile
+    return zlib.compress(tile.tobytes(), COMPRESSION_LEVEL)
+
+
+def _stored_nbytes(tile: StoredTile) -> int:
+    if isinstance(tile, int):
+        return 0
+    if isinstance(tile, bytes):
+        return len(tile)
+    return len(tile) * PIXEL_BYTES
+
+
+def _union_bounds(first: PatchBounds, second: PatchBounds) -> PatchBounds:
+    left = min(first[0], second[0])
+    top = min(first[1], second[1])
+    right = max(first[0] + first[2], second[0] + second[2])
+    bottom = max(first[1] + first[3], second[1] + second[3])
+    return left, top, right - left, bottom - top
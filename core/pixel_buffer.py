@@ -0,0 +1,113 @@
+"""Bulk operations over contiguous 32-bit ARGB pixel buffers."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+PIXEL_TYPECODE = "I"
+PIXEL_BYTES = 4
+PixelBuffer = array
+Bitmap = tuple[int, int, PixelBuffer]
+TRANSPARENT_COLOR = 0
+
+# Masks with fewer runs than len(mask) / ratio are filled run by run with slice copies.
+_RUN_FILL_RATIO = 16
+_SELECTED_LANE_TABLE = b"\x00\xff" + bytes(254)
+
+if array(PIXEL_TYPECODE).itemsize != PIXEL_BYTES:
+    raise ImportError(f"array typecode {PIXEL_TYPECODE!r} is not {PIXEL_BYTES} bytes wide on this platform")
+
+
+def filled_buffer(color: int, size: int) -> PixelBuffer:
+    return array(PIXEL_TYPECODE, (color,)) * size
+
+
+def copy_buffer(pixels: PixelBuffer) -> PixelBuffer:
+    return array(PIXEL_TYPECODE, pixels)
+
+
+def buffer_from_bytes(data: bytes | bytearray | memoryview) -> PixelBuffer:
+    pixels = array(PIXEL_TYPECODE)
+    pixels.frombytes(data)
+    return pixels
+
+
+def fill_spans(
+    pixels: PixelBuffer,
+    stride: int,
+    spans: Iterable[tuple[int, int, int]],
+    color: int,
+    origin: tuple[int, int] = (0, 0),
+) -> None:
+    """Fill inclusive ``(row, left, right)`` spans given in coordinates relative to ``origin``."""
+    origin_col, origin_row = origin
+    fill_row = filled_buffer(color, stride)
+    for row, left, right in spans:
+        start = (row - origin_row) * stride + left - origin_col
+        pixels[start:start + right - left + 1] = fill_row[:right - left + 1]
+
+
+def color_bytes(color: int) -> bytes:
+    return array(PIXEL_TYPECODE, (color,)).tobytes()
+
+
+def is_filled(pixels: PixelBuffer, color: int) -> bool:
+    return pixels.tobytes() == color_bytes(color) * len(pixels)
+
+
+def color_mask(pixels: PixelBuffer, color: int, tolerance: int = 0) -> bytes:
+    """Return one byte per pixel: 1 where every ARGB channel is within ``tolerance`` of ``color``."""
+    raw = pixels.tobytes()
+    mask = -1
+    for offset, channel in enumerate(color_bytes(color)):
+        plane = raw[offset::PIXEL_BYTES].translate(_match_table(channel, tolerance))
+        mask &= int.from_bytes(plane, "little")
+    return mask.to_bytes(len(pixels), "little") if pixels else b""
+
+
+def mask_difference(mask: bytes, excluded: bytes) -> bytes:
+    """Return ``mask`` with every pixel selected in ``excluded`` cleared."""
+    difference = int.from_bytes(mask, "little") & ~int.from_bytes(excluded, "little")
+    return difference.to_bytes(len(mask), "little")
+
+
+def masked_fill(pixels: PixelBuffer, mask: bytes, color: int) -> None:
+    """Set every pixel whose mask byte is 1 to ``color``, in place."""
+    run_count = mask.count(b"\x00\x01") + (mask[:1] == b"\x01")
+    if run_count * _RUN_FILL_RATIO > len(mask):
+        lanes = bytearray(len(mask) * PIXEL_BYTES)
+        selected = mask.translate(_SELECTED_LANE_TABLE)
+        for offset in range(PIXEL_BYTES):
+            lanes[offset::PIXEL_BYTES] = selected
+        lane_mask = int.from_bytes(lanes, "little")
+        value = int.from_bytes(pixels.tobytes(), "little")
+        value ^= (value ^ int.from_bytes(color_bytes(color) * len(mask), "little")) & lane_mask
+        pixels[:] = buffer_from_bytes(value.to_bytes(len(lanes), "little"))
+        return
+
+    start = mask.find(1)
+    while start != -1:
+        stop = mask.find(0, start)
+        if stop == -1:
+            stop = len(mask)
+        pixels[start:stop] = filled_buffer(color, stop - start)
+        start = mask.find(1, stop)
+
+
+def masked_copy(pixels: PixelBuffer, source: PixelBuffer, mask: bytes) -> None:
+    """Copy every pixel of ``source`` whose mask byte is 1 into ``pixels``, in place."""
+    start = mask.find(1)
+    while start != -1:
+        stop = mask.find(0, start)
+        if stop == -1:
+            stop = len(mask)
+        pixels[start:stop] = source[start:stop]
+        start = mask.find(1, stop)
+
+
+def _match_table(value: int, tolerance: int) -> bytes:
+    low = max(0, value - tolerance)
+    high = min(255, value + tolerance)
+    table = bytearray(256)
+    table[low:high + 1] = b"\x01" * (high - low + 1)
+    return bytes(table)
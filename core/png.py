@@ -0,0 +1,258 @@
+"""PNG decoding and encoding with the standard library, for scripts that run without Qt."""
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from collections.abc import Callable
+from os import PathLike
+
+from core.pixel_buffer import PIXEL_BYTES, Bitmap, PixelBuffer, buffer_from_bytes
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+DEFAULT_COMPRESSION_LEVEL = 6
+
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_ADAM7_PASSES = ((0, 0, 8, 8), (4, 0, 8, 8), (0, 4, 4, 8), (2, 0, 4, 4), (0, 2, 2, 4), (1, 0, 2, 2), (0, 1, 1, 2))
+_RGBA_OFFSETS = (2, 1, 0, 3) if sys.byteorder == "little" else (1, 2, 3, 0)
+
+StrPath = str | PathLike[str]
+
+
+def read_png(path: StrPath) -> Bitmap:
+    with open(path, "rb") as file:
+        return decode_png(file.read())
+
+
+def write_png(path: StrPath, bitmap: Bitmap, compression_level: int = DEFAULT_COMPRESSION_LEVEL) -> None:
+    data = encode_png(bitmap, compression_level)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def decode_png(data: bytes) -> Bitmap:
+    """Decode any standard PNG, interlaced or not, into ARGB32 pixels."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+
+    header = b""
+    palette = b""
+    transparency = b""
+    compressed = bytearray()
+    position = len(PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        chunk = data[position + 8:position + 8 + length]
+        position += length + 12
+        if kind == b"IHDR":
+            header = chunk
+        elif kind == b"PLTE":
+            palette = chunk
+        elif kind == b"tRNS":
+            transparency = chunk
+        elif kind == b"IDAT":
+            compressed += chunk
+        elif kind == b"IEND":
+            break
+    if len(header) != 13:
+        raise ValueError("PNG file has no IHDR chunk")
+
+    width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+    if color_type not in _CHANNELS or depth not in (1, 2, 4, 8, 16):
+        raise ValueError(f"Unsupported PNG color type {color_type} with bit depth {depth}")
+
+    raw = zlib.decompress(compressed)
+    to_rgba = _rgba_converter(color_type, depth, palette, transparency)
+    bits_per_pixel = _CHANNELS[color_type] * depth
+    if not interlace:
+        rows = _unfilter(raw, 0, width, height, bits_per_pixel)
+        return width, height, _pixels_from_rgba(b"".join(to_rgba(row, width) for row in rows))
+
+    rgba = bytearray(width * height * PIXEL_BYTES)
+    offset = 0
+    for start_col, start_row, col_step, row_step in _ADAM7_PASSES:
+        pass_width = -(-(width - start_col) // col_step)
+        pass_height = -(-(height - start_row) // row_step)
+        if pass_width <= 0 or pass_height <= 0:
+            continue
+        rows = _unfilter(raw, offset, pass_width, pass_height, bits_per_pixel)
+        offset += pass_height * (1 + _row_bytes(pass_width, bits_per_pixel))
+        for pass_row, row in enumerate(rows):
+            pixels = to_rgba(row, pass_width)
+            target = (start_row + pass_row * row_step) * width
+            for pass_col in range(pass_width):
+                start = (target + start_col + pass_col * col_step) * PIXEL_BYTES
+                rgba[start:start + PIXEL_BYTES] = pixels[pass_col * PIXEL_BYTES:(pass_col + 1) * PIXEL_BYTES]
+    return width, height, _pixels_from_rgba(bytes(rgba))
+
+
+def encode_png(bitmap: Bitmap, compression_level: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    """Encode ARGB32 pixels as an 8-bit RGBA PNG."""
+    width, height, pixels = bitmap
+    rgba = _rgba_from_pixels(pixels)
+    row_bytes = width * PIXEL_BYTES
+    raw = b"".join(b"\x00" + rgba[row * row_bytes:(row + 1) * row_bytes] for row in range(height))
+    return b"".join((
+        PNG_SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+        _chunk(b"IDAT", zlib.compress(raw, compression_level)),
+        _chunk(b"IEND", b""),
+    ))
+
+
+def _chunk(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+
+def _row_bytes(width: int, bits_per_pixel: int) -> int:
+    return -(-width * bits_per_pixel // 8)
+
+
+def _unfilter(raw: bytes, offset: int, width: int, height: int, bits_per_pixel: int) -> list[bytes]:
+    row_bytes = _row_bytes(width, bits_per_pixel)
+    step = max(1, bits_per_pixel // 8)
+    previous = bytes(row_bytes)
+    lanes = _ByteLanes(row_bytes)
+    rows = []
+    for _ in range(height):
+        kind = raw[offset]
+        line = bytearray(raw[offset + 1:offset + 1 + row_bytes])
+        offset += row_bytes + 1
+        if kind == 1:
+            value = int.from_bytes(line, "little")
+            shift = step
+            while shift < row_bytes:
+                value = _add_bytes(value, (value << shift * 8) & lanes.full, lanes)
+                shift *= 2
+            line = bytearray(value.to_bytes(row_bytes, "little"))
+        elif kind == 2:
+            value = _add_bytes(int.from_bytes(line, "little"), int.from_bytes(previous, "little"), lanes)
+            line = bytearray(value.to_bytes(row_bytes, "little"))
+        elif kind == 3:
+            for index in range(row_bytes):
+                left = line[index - step] if index >= step else 0
+                line[index] = (line[index] + ((left + previous[index]) >> 1)) & 0xFF
+        elif kind == 4:
+            for index in range(step):
+                line[index] = (line[index] + previous[index]) & 0xFF
+            for index in range(step, row_bytes):
+                line[index] = (line[index] + _paeth(line[index - step], previous[index], previous[index - step])) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"Invalid PNG filter type {kind}")
+        previous = bytes(line)
+        rows.append(previous)
+    return rows
+
+
+class _ByteLanes:
+    """Masks for adding ``size`` bytes at once, packed little-endian into one integer."""
+
+    def __init__(self, size: int) -> None:
+        self.full = (1 << size * 8) - 1
+        self.low = int.from_bytes(b"\x7f" * size, "little")
+        self.high = int.from_bytes(b"\x80" * size, "little")
+
+
+def _add_bytes(first: int, second: int, lanes: _ByteLanes) -> int:
+    """Add two packed byte rows lane by lane, modulo 256, without carries between bytes."""
+    return ((first & lanes.low) + (second & lanes.low)) ^ ((first ^ second) & lanes.high)
+
+
+def _paeth(left: int, above: int, upper_left: int) -> int:
+    left_distance = abs(above - upper_left)
+    above_distance = abs(left - upper_left)
+    upper_left_distance = abs(left + above - 2 * upper_left)
+    if left_distance <= above_distance and left_distance <= upper_left_distance:
+        return left
+    if above_distance <= upper_left_distance:
+        return above
+    return upper_left
+
+
+def _rgba_converter(color_type: int, depth: int, palette: bytes, transparency: bytes) -> Callable[[bytes, int], bytes]:
+    """Return a function turning one unfiltered row of ``width`` pixels into 8-bit RGBA bytes."""
+    if color_type == 3:
+        alphas = transparency + b"\xff" * (256 - len(transparency))
+        table = [palette[index * 3:index * 3 + 3] + alphas[index:index + 1] for index in range(len(palette) // 3)]
+        return lambda row, width: b"".join(table[index] for index in _samples(row, width, depth))
+
+    channels = _CHANNELS[color_type]
+
+    def convert(row: bytes, width: int) -> bytes:
+        samples = bytes(_samples(row, width * channels, depth))
+        if color_type == 0:
+            if depth < 8:
+                samples = bytes(sample * 255 // ((1 << depth) - 1) for sample in samples)
+            rgba = bytearray(width * PIXEL_BYTES)
+            rgba[0::4] = rgba[1::4] = rgba[2::4] = samples
+            rgba[3::4] = b"\xff" * width
+            key = _color_key(transparency, 1)
+        elif color_type == 4:
+            rgba = bytearray(width * PIXEL_BYTES)
+            rgba[0::4] = rgba[1::4] = rgba[2::4] = samples[0::2]
+            rgba[3::4] = samples[1::2]
+            return bytes(rgba)
+        elif color_type == 2:
+            rgba = bytearray(width * PIXEL_BYTES)
+            for channel in range(3):
+                rgba[channel::4] = samples[channel::3]
+            rgba[3::4] = b"\xff" * width
+            key = _color_key(transparency, 3)
+        else:
+            return samples
+        if key is not None:
+            for index in range(width):
+                if _raw_sample_key(row, index, channels, depth) == key:
+                    rgba[index * PIXEL_BYTES + 3] = 0
+        return bytes(rgba)
+
+    return convert
+
+
+def _samples(row: bytes, count: int, depth: int) -> list[int]:
+    """Return the first ``count`` samples of ``row``, with 16-bit samples rounded to 8 bits."""
+    if depth == 8:
+        return list(row[:count])
+    if depth == 16:
+        return [(sample * 255 + 32767) // 65535 for sample in struct.unpack_from(f">{count}H", row)]
+
+    per_byte = 8 // depth
+    mask = (1 << depth) - 1
+    samples = [
+        (byte >> (8 - depth * (slot + 1))) & mask
+        for byte in row
+        for slot in range(per_byte)
+    ]
+    return samples[:count]
+
+
+def _color_key(transparency: bytes, channels: int) -> tuple[int, ...] | None:
+    if len(transparency) != channels * 2:
+        return None
+    return struct.unpack(f">{channels}H", transparency)
+
+
+def _raw_sample_key(row: bytes, index: int, channels: int, depth: int) -> tuple[int, ...]:
+    if depth == 16:
+        return struct.unpack_from(f">{channels}H", row, index * channels * 2)
+    if depth == 8:
+        return tuple(row[index * channels:(index + 1) * channels])
+
+    per_byte = 8 // depth
+    byte = row[index // per_byte]
+    return ((byte >> (8 - depth * (index % per_byte + 1))) & ((1 << depth) - 1),)
+
+
+def _pixels_from_rgba(rgba: bytes) -> PixelBuffer:
+    native = bytearray(len(rgba))
+    for channel, offset in enumerate(_RGBA_OFFSETS):
+        native[offset::PIXEL_BYTES] = rgba[channel::PIXEL_BYTES]
+    return buffer_from_bytes(native)
+
+
+def _rgba_from_pixels(pixels: PixelBuffer) -> bytes:
+    native = pixels.tobytes()
+    rgba = bytearray(len(native))
+    for channel, offset in enumerate(_RGBA_OFFSETS):
+        rgba[channel::PIXEL_BYTES] = native[offset::PIXEL_BYTES]
+    return bytes(rgba)
@@ -0,0 +1,80 @@
+"""Nearest-neighbour reductions of a pixel buffer for zoomed-out views."""
+from __future__ import annotations
+
+from core.dirty import DirtyRegion
+from core.pixel_buffer import PixelBuffer, copy_buffer, filled_buffer
+from core.tiles import TiledPixels
+
+PyramidLevel = tuple[int, int, PixelBuffer]
+
+
+class PixelPyramid:
+    """Levels at 1/2, 1/4, ... of the source size, refreshed lazily from invalidated rectangles.
+
+    Every pixel of level ``n`` is the source pixel at ``(x << n, y << n)``, so a
+    source edit only has to be resampled on the rows and columns it covers.
+    """
+
+    def __init__(self) -> None:
+        self._columns = 0
+        self._rows = 0
+        self._levels: list[PixelBuffer] = []
+        self._dirty_region = DirtyRegion()
+        self._is_stale = True
+
+    def invalidate(self, left: int, top: int, right: int, bottom: int) -> None:
+        if not self._is_stale:
+            self._dirty_region.add(left, top, right, bottom)
+
+    def reset(self) -> None:
+        self._is_stale = True
+        self._dirty_region = DirtyRegion()
+
+    def level(self, pixels: TiledPixels, min_columns: int, min_rows: int) -> PyramidLevel | None:
+        """Return a copy of the smallest level at least ``min_columns`` x ``min_rows``, or None for ``pixels``."""
+        columns = pixels.columns
+        rows = pixels.rows
+        self._sync(pixels, columns, rows)
+        shift = 0
+        while (
+            shift < len(self._levels)
+            and columns >> (shift + 1) >= min_columns
+            and rows >> (shift + 1) >= min_rows
+        ):
+            shift += 1
+        if shift == 0:
+            return None
+        return columns >> shift, rows >> shift, copy_buffer(self._levels[shift - 1])
+
+    def _sync(self, pixels: TiledPixels, columns: int, rows: int) -> None:
+        if self._is_stale or (columns, rows) != (self._columns, self._rows):
+            self._columns = columns
+            self._rows = rows
+            self._levels = []
+            shift = 1
+            while columns >> shift and rows >> shift:
+                self._levels.append(filled_buffer(0, (columns >> shift) * (rows >> shift)))
+                shift += 1
+            self._dirty_region = DirtyRegion()
+            self._is_stale = False
+            self._resample(pixels, 0, 0, columns - 1, rows - 1)
+            return
+
+        for left, top, width, height in self._dirty_region.take():
+            self._resample(pixels, left, top, left + width - 1, top + height - 1)
+
+    def _resample(self, pixels: TiledPixels, left: int, top: int, right: int, bottom: int) -> None:
+        for shift, level in enumerate(self._levels, start=1):
+            step = 1 << shift
+            level_columns = self._columns >> shift
+            first_col = (left + step - 1) >> shift
+            last_col = min(right >> shift, level_columns - 1)
+            first_row = (top + step - 1) >> shift
+            last_row = min(bottom >> shift, (self._rows >> shift) - 1)
+            if first_col > last_col or first_row > last_row:
+                continue
+
+            for row in range(first_row, last_row + 1):
+                target = row * level_columns
+                source = pixels.read_row(row << shift, first_col << shift, last_col << shift)
+                level[target + first_col:target + last_col + 1] = source[::step]
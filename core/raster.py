@@ -0,0 +1,109 @@
+"""Integer rasterizers for the shape tools."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Literal
+
+ShapeKind = Literal["rect", "ellipse"]
+ShapeBounds = tuple[int, int, int, int]
+Span = tuple[int, int, int]
+
+
+def shape_spans(shape_kind: ShapeKind, bounds: ShapeBounds, filled: bool = False) -> list[Span]:
+    """Return the ``(row, left, right)`` runs, inclusive, covered by a shape inside ``bounds``."""
+    left, top, width, height = bounds
+    right = left + width - 1
+    bottom = top + height - 1
+
+    if shape_kind == "rect" or width <= 2 or height <= 2:
+        if filled or width <= 2 or height <= 2:
+            return [(row, left, right) for row in range(top, bottom + 1)]
+        return [(top, left, right), *_rect_side_spans(left, right, top, bottom), (bottom, left, right)]
+
+    points = ellipse_points(left, top, right, bottom)
+    if filled:
+        return _row_extents(points)
+    return _merge_points(points)
+
+
+def ellipse_points(left: int, top: int, right: int, bottom: int) -> list[tuple[int, int]]:
+    """Bresenham ellipse fitted to an inclusive bounding box, after A. Zingl's plotEllipseRect."""
+    a = right - left
+    b = bottom - top
+    b_odd = b & 1
+    dx = 4 * (1 - a) * b * b
+    dy = 4 * (b_odd + 1) * a * a
+    err = dx + dy + b_odd * a * a
+    x0, x1 = left, right
+    y0 = top + (b + 1) // 2
+    y1 = y0 - b_odd
+    step_a = 8 * a * a
+    step_b = 8 * b * b
+
+    points: list[tuple[int, int]] = []
+    while x0 <= x1:
+        points += ((x1, y0), (x0, y0), (x0, y1), (x1, y1))
+        doubled_err = 2 * err
+        if doubled_err <= dy:
+            y0 += 1
+            y1 -= 1
+            dy += step_a
+            err += dy
+        if doubled_err >= dx or 2 * err > dy:
+            x0 += 1
+            x1 -= 1
+            dx += step_b
+            err += dx
+
+    # Very flat ellipses stop before reaching the tips; finish them.
+    while y0 - y1 <= b:
+        points += ((x0 - 1, y0), (x1 + 1, y0), (x0 - 1, y1), (x1 + 1, y1))
+        y0 += 1
+        y1 -= 1
+    return points
+
+
+def line_points(start_col: int, start_row: int, end_col: int, end_row: int) -> list[tuple[int, int]]:
+    """Bresenham line between two cells, both ends included."""
+    dx = abs(end_col - start_col)
+    dy = -abs(end_row - start_row)
+    step_col = 1 if start_col < end_col else -1
+    step_row = 1 if start_row < end_row else -1
+    err = dx + dy
+    col, row = start_col, start_row
+
+    points = [(col, row)]
+    while (col, row) != (end_col, end_row):
+        doubled_err = 2 * err
+        if doubled_err >= dy:
+            err += dy
+            col += step_col
+        if doubled_err <= dx:
+            err += dx
+            row += step_row
+        points.append((col, row))
+    return points
+
+
+def _rect_side_spans(left: int, right: int, top: int, bottom: int) -> Iterable[Span]:
+    for row in range(top + 1, bottom):
+        yield row, left, left
+        yield row, right, right
+
+
+def _row_extents(points: Iterable[tuple[int, int]]) -> list[Span]:
+    extents: dict[int, tuple[int, int]] = {}
+    for col, row in points:
+        low, high = extents.get(row, (col, col))
+        extents[row] = (min(low, col), max(high, col))
+    return [(row, low, high) for row, (low, high) in sorted(extents.items())]
+
+
+def _merge_points(points: Iterable[tuple[int, int]]) -> list[Span]:
+    spans: list[Span] = []
+    for col, row in sorted(set(points), key=lambda point: (point[1], point[0])):
+        if spans and spans[-1][0] == row and spans[-1][2] == col - 1:
+            spans[-1] = (row, spans[-1][1], col)
+        else:
+            spans.append((row, col, col))
+    return spans
@@ -0,0 +1,347 @@
+"""Copy-on-write pixel storage split into fixed-size square tiles."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+
+from core.pixel_buffer import (
+    PIXEL_BYTES,
+    PixelBuffer,
+    color_mask,
+    copy_buffer,
+    filled_buffer,
+    is_filled,
+    mask_difference,
+    masked_fill,
+)
+
+TILE_SIZE = 64
+
+# A tile is a single colour value when uniform, otherwise a row-major pixel buffer.
+Tile = int | PixelBuffer
+# Per-tile match masks; ``None`` selects the whole tile.
+TileMasks = dict[int, bytes | None]
+TileRect = tuple[int, int, int, int]
+
+
+class TiledPixels:
+    """A ``columns`` x ``rows`` canvas stored as ``TILE_SIZE`` tiles in row-major order.
+
+    Buffers handed out by ``share_tile`` are never written again: the next write
+    to that tile copies it first, so history entries and snapshots can keep
+    references instead of copies. Edge tiles are cropped to the canvas size.
+    """
+
+    def __init__(self, columns: int, rows: int, color: int) -> None:
+        self.columns = columns
+        self.rows = rows
+        self.tile_columns = -(-columns // TILE_SIZE)
+        self.tile_rows = -(-rows // TILE_SIZE)
+        self._tiles: list[Tile] = [color] * (self.tile_columns * self.tile_rows)
+        self._owned = bytearray(len(self._tiles))
+        self._tile_widths = [min(TILE_SIZE, columns - tile_col * TILE_SIZE) for tile_col in range(self.tile_columns)]
+
+    @classmethod
+    def from_buffer(cls, columns: int, rows: int, pixels: PixelBuffer) -> TiledPixels:
+        store = cls(columns, rows, 0)
+        for index in range(len(store._tiles)):
+            left, top, width, height = store.tile_rect(index)
+            tile = filled_buffer(0, 0)
+            for row in range(top, top + height):
+                start = row * columns + left
+                tile += pixels[start:start + width]
+            store._tiles[index] = tile
+            store._owned[index] = 1
+            store.compact_tile(index)
+        return store
+
+    @property
+    def tile_count(self) -> int:
+        return len(self._tiles)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(tile) for tile in self._tiles if not isinstance(tile, int)) * PIXEL_BYTES
+
+    def to_buffer(self) -> PixelBuffer:
+        return self.read_rect(0, 0, self.columns, self.rows)
+
+    def tile_rect(self, index: int) -> TileRect:
+        """Return the ``(left, top, width, height)`` pixels covered by tile ``index``."""
+        tile_row, tile_col = divmod(index, self.tile_columns)
+        left = tile_col * TILE_SIZE
+        top = tile_row * TILE_SIZE
+        return left, top, min(TILE_SIZE, self.columns - left), min(TILE_SIZE, self.rows - top)
+
+    def tiles_in_rect(self, left: int, top: int, right: int, bottom: int) -> Iterator[int]:
+        for tile_row in range(top // TILE_SIZE, bottom // TILE_SIZE + 1):
+            first = tile_row * self.tile_columns
+            yield from range(first + left // TILE_SIZE, first + right // TILE_SIZE + 1)
+
+    def tiles_bounds(self, indices: Iterable[int]) -> TileRect | None:
+        """Return the ``(left, top, width, height)`` box enclosing the given tiles."""
+        rects = [self.tile_rect(index) for index in indices]
+        if not rects:
+            return None
+
+        left = min(rect[0] for rect in rects)
+        top = min(rect[1] for rect in rects)
+        right = max(rect[0] + rect[2] for rect in rects)
+        bottom = max(rect[1] + rect[3] for rect in rects)
+        return left, top, right - left, bottom - top
+
+    def tile(self, index: int) -> Tile:
+        """Return tile ``index`` for reading; callers that keep it must not write to it."""
+        return self._tiles[index]
+
+    def share_tile(self, index: int) -> Tile:
+        self._owned[index] = 0
+        return self._tiles[index]
+
+    def put_tile(self, index: int, tile: Tile, owned: bool = False) -> None:
+        self._tiles[index] = tile
+        self._owned[index] = owned
+
+    def compact_tile(self, index: int) -> None:
+        tile = self._tiles[index]
+        if not isinstance(tile, int) and is_filled(tile, tile[0]):
+            self.put_tile(index, tile[0])
+
+    def fill(self, color: int) -> None:
+        self._tiles = [color] * len(self._tiles)
+        self._owned = bytearray(len(self._tiles))
+
+    def pixel(self, col: int, row: int) -> int:
+        tile_col = col // TILE_SIZE
+        tile = self._tiles[(row // TILE_SIZE) * self.tile_columns + tile_col]
+        if isinstance(tile, int):
+            return tile
+        return tile[(row % TILE_SIZE) * self._tile_widths[tile_col] + col % TILE_SIZE]
+
+    def set_pixel(self, col: int, row: int, color: int) -> None:
+        tile_col = col // TILE_SIZE
+        index = (row // TILE_SIZE) * self.tile_columns + tile_col
+        tile = self._tiles[index]
+        if isinstance(tile, int):
+            if tile == color:
+                return
+            tile = self._writable_tile(index)
+        elif not self._owned[index]:
+            tile = self._writable_tile(index)
+        tile[(row % TILE_SIZE) * self._tile_widths[tile_col] + col % TILE_SIZE] = color
+
+    def read_row(self, row: int, left: int, right: int) -> PixelBuffer:
+        """Return the pixels of ``row`` from ``left`` to ``right`` inclusive."""
+        pixels = filled_buffer(0, 0)
+        offset = row % TILE_SIZE
+        for index, start, stop, tile_width in self._row_segments(row, left, right):
+            tile = self._tiles[index]
+            if isinstance(tile, int):
+                pixels += filled_buffer(tile, stop - start)
+            else:
+                pixels += tile[offset * tile_width + start:offset * tile_width + stop]
+        return pixels
+
+    def read_rect(self, left: int, top: int, width: int, height: int) -> PixelBuffer:
+        """Return a ``width`` x ``height`` block as a row-major buffer, one band of tile rows at a time.
+
+        Runs of uniform tiles within a band are pre-filled once and reused for each of its rows.
+        """
+        pixels = filled_buffer(0, 0)
+        if width <= 0:
+            return pixels
+
+        row = top
+        while row < top + height:
+            band_stop = min(top + height, (row // TILE_SIZE + 1) * TILE_SIZE)
+            pieces: list[PixelBuffer | tuple[PixelBuffer, int, int, int]] = []
+            uniform_run = filled_buffer(0, 0)
+            for index, start, stop, tile_width in self._row_segments(row, left, left + width - 1):
+                tile = self._tiles[index]
+                if isinstance(tile, int):
+                    uniform_run += filled_buffer(tile, stop - start)
+                    continue
+                if uniform_run:
+                    pieces.append(uniform_run)
+                    uniform_run = filled_buffer(0, 0)
+                pieces.append((tile, start, stop, tile_width))
+            if uniform_run:
+                pieces.append(uniform_run)
+
+            if len(pieces) == 1 and isinstance(pieces[0], PixelBuffer):
+                pixels += pieces[0] * (band_stop - row)
+            else:
+                for tile_row in range(row % TILE_SIZE, row % TILE_SIZE + band_stop - row):
+                    for piece in pieces:
+                        if isinstance(piece, PixelBuffer):
+                            pixels += piece
+                        else:
+                            tile, start, stop, tile_width = piece
+                            offset = tile_row * tile_width
+                            pixels += tile[offset + start:offset + stop]
+            row = band_stop
+        return pixels
+
+    def write_row(self, row: int, left: int, pixels: PixelBuffer) -> None:
+        """Copy ``pixels`` into ``row`` starting at column ``left``."""
+        offset = row % TILE_SIZE
+        position = 0
+        for index, start, stop, tile_width in self._row_segments(row, left, left + len(pixels) - 1):
+            segment = pixels[position:position + stop - start]
+            position += stop - start
+            tile = self._tiles[index]
+            if isinstance(tile, int) and is_filled(segment, tile):
+                continue
+            self._writable_tile(index)[offset * tile_width + start:offset * tile_width + stop] = segment
+
+    def fill_span(self, row: int, left: int, right: int, color: int) -> None:
+        """Set the pixels of ``row`` from ``left`` to ``right`` inclusive to ``color``."""
+        offset = row % TILE_SIZE
+        fill_row = filled_buffer(color, TILE_SIZE)
+        for index, start, stop, tile_width in self._row_segments(row, left, right):
+            if self._tiles[index] != color:
+                tile = self._writable_tile(index)
+                tile[offset * tile_width + start:offset * tile_width + stop] = fill_row[:stop - start]
+
+    def fill_spans(self, spans: Iterable[tuple[int, int, int]], color: int) -> None:
+        """Fill inclusive ``(row, left, right)`` spans."""
+        for row, left, right in spans:
+            self.fill_span(row, left, right, color)
+
+    def match_row(self, row: int, color: int, tolerance: int = 0) -> bytes:
+        """Return one byte per pixel of ``row``: 1 where every channel is within ``tolerance`` of ``color``."""
+        offset = row % TILE_SIZE
+        uniform_matches: dict[int, bool] = {}
+        mask = bytearray()
+        pending = filled_buffer(0, 0)
+        for index, start, stop, tile_width in self._row_segments(row, 0, self.columns - 1):
+            tile = self._tiles[index]
+            if not isinstance(tile, int):
+                pending += tile[offset * tile_width + start:offset * tile_width + stop]
+                continue
+
+            if pending:
+                mask += color_mask(pending, color, tolerance)
+                pending = filled_buffer(0, 0)
+            if tile not in uniform_matches:
+                uniform_matches[tile] = _matches(tile, color, tolerance)
+            mask += (b"\x01" if uniform_matches[tile] else b"\x00") * (stop - start)
+        if pending:
+            mask += color_mask(pending, color, tolerance)
+        return bytes(mask)
+
+    def match_tiles(self, color: int, tolerance: int = 0, excluded: int | None = None) -> TileMasks:
+        """Return masks of the pixels within ``tolerance`` of ``color``, skipping pixels equal to ``excluded``."""
+        masks: TileMasks = {}
+        for index, tile in enumerate(self._tiles):
+            if isinstance(tile, int):
+                if tile != excluded and _matches(tile, color, tolerance):
+                    masks[index] = None
+                continue
+
+            mask = color_mask(tile, color, tolerance)
+            if excluded is not None:
+                mask = mask_difference(mask, color_mask(tile, excluded))
+            if 1 in mask:
+                masks[index] = mask if 0 in mask else None
+        return masks
+
+    def fill_masked(self, masks: TileMasks, color: int) -> None:
+        for index, mask in masks.items():
+            if mask is None:
+                self.put_tile(index, color)
+            else:
+                masked_fill(self._writable_tile(index), mask, color)
+                self.compact_tile(index)
+
+    def shifted(self, dx: int, dy: int, background_color: int, wrap: bool = False) -> TiledPixels:
+        """Return a copy moved by ``(dx, dy)``; uncovered pixels get ``background_color`` unless ``wrap`` is set.
+
+        Target tiles whose sources are all one uniform colour stay uniform without touching any pixels.
+        """
+        shifted_pixels = TiledPixels(self.columns, self.rows, background_color)
+        for index in range(len(self._tiles)):
+            left, top, width, height = self.tile_rect(index)
+            col_pieces = _source_pieces(left - dx, width, self.columns, wrap)
+            row_pieces = _source_pieces(top - dy, height, self.rows, wrap)
+            colors: set[int | None] = set()
+            for source_top, piece_height in row_pieces:
+                for source_left, piece_width in col_pieces:
+                    if source_top is None or source_left is None:
+                        colors.add(background_color)
+                        continue
+                    for source_index in self.tiles_in_rect(
+                        source_left, source_top, source_left + piece_width - 1, source_top + piece_height - 1
+                    ):
+                        tile = self._tiles[source_index]
+                        colors.add(tile if isinstance(tile, int) else None)
+            uniform_color = colors.pop() if len(colors) == 1 else None
+            if uniform_color is not None:
+                shifted_pixels.put_tile(index, uniform_color)
+                continue
+
+            tile = filled_buffer(0, 0)
+            for source_top, piece_height in row_pieces:
+                for row in range(piece_height):
+                    for source_left, piece_width in col_pieces:
+                        if source_top is None or source_left is None:
+                            tile += filled_buffer(background_color, piece_width)
+                        else:
+                            tile += self.read_row(source_top + row, source_left, source_left + piece_width - 1)
+            shifted_pixels.put_tile(index, tile, owned=True)
+        return shifted_pixels
+
+    def _row_segments(self, row: int, left: int, right: int) -> Iterator[tuple[int, int, int, int]]:
+        """Yield ``(index, start, stop, width)`` for each tile crossed by ``row`` between ``left`` and ``right``.
+
+        ``start`` and ``stop`` are tile-local columns and ``width`` is the tile's row length.
+        """
+        first = (row // TILE_SIZE) * self.tile_columns
+        first_col = left // TILE_SIZE
+        last_col = right // TILE_SIZE
+        widths = self._tile_widths
+        if first_col == last_col:
+            yield first + first_col, left - first_col * TILE_SIZE, right - first_col * TILE_SIZE + 1, widths[first_col]
+            return
+
+        yield first + first_col, left - first_col * TILE_SIZE, widths[first_col], widths[first_col]
+        for tile_col in range(first_col + 1, last_col):
+            yield first + tile_col, 0, TILE_SIZE, TILE_SIZE
+        yield first + last_col, 0, right - last_col * TILE_SIZE + 1, widths[last_col]
+
+    def _writable_tile(self, index: int) -> PixelBuffer:
+        tile = self._tiles[index]
+        if isinstance(tile, int):
+            _, _, width, height = self.tile_rect(index)
+            tile = filled_buffer(tile, width * height)
+        elif self._owned[index]:
+            return tile
+        else:
+            tile = copy_buffer(tile)
+        self.put_tile(index, tile, owned=True)
+        return tile
+
+
+def _source_pieces(start: int, length: int, size: int, wrap: bool) -> list[tuple[int | None, int]]:
+    """Split ``length`` positions from ``start`` into in-canvas ``(start, length)`` runs; ``None`` runs fall outside."""
+    if wrap:
+        start %= size
+        first = min(length, size - start)
+        pieces: list[tuple[int | None, int]] = [(start, first)]
+        if length > first:
+            pieces.append((0, length - first))
+        return pieces
+
+    pieces = []
+    if start < 0:
+        pieces.append((None, min(length, -start)))
+    inside_start = max(start, 0)
+    inside_stop = min(start + length, size)
+    if inside_stop > inside_start:
+        pieces.append((inside_start, inside_stop - inside_start))
+    if start + length > size:
+        pieces.append((None, start + length - max(size, start)))
+    return pieces
+
+
+def _matches(value: int, color: int, tolerance: int) -> bool:
+    return color_mask(filled_buffer(value, 1), color, tolerance) == b"\x01"
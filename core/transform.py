@@ -0,0 +1,39 @@
+"""Whole-image transforms on ARGB32 bitmaps."""
+from __future__ import annotations
+
+from array import array
+
+from core.blend import blend_tiles
+from core.pixel_buffer import PIXEL_TYPECODE, Bitmap, filled_buffer
+
+
+def scaled(bitmap: Bitmap, columns: int, rows: int) -> Bitmap:
+    """Resize with nearest-neighbour sampling, so pixel art keeps hard edges."""
+    source_columns, source_rows, pixels = bitmap
+    if columns <= 0 or rows <= 0:
+        raise ValueError(f"Invalid size {columns}x{rows}")
+    if (columns, rows) == (source_columns, source_rows):
+        return bitmap
+
+    source_cols = [col * source_columns // columns for col in range(columns)]
+    result = array(PIXEL_TYPECODE)
+    previous_row = -1
+    scaled_row = array(PIXEL_TYPECODE)
+    for row in range(rows):
+        source_row = row * source_rows // rows
+        if source_row != previous_row:
+            start = source_row * source_columns
+            source = pixels[start:start + source_columns]
+            scaled_row = array(PIXEL_TYPECODE, map(source.__getitem__, source_cols))
+            previous_row = source_row
+        result += scaled_row
+    return columns, rows, result
+
+
+def flattened(bitmap: Bitmap, background_color: int) -> Bitmap:
+    """Composite the pixels over ``background_color`` and drop their transparency."""
+    columns, rows, pixels = bitmap
+    result = blend_tiles(background_color | 0xFF000000, pixels, columns * rows, "normal")
+    if isinstance(result, int):
+        result = filled_buffer(result, columns * rows)
+    return columns, rows, result
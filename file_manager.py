@@ -10,8 +10,8 @@ from ui.canvas import Canvas
 from ui.dialogs.confirm import ask_choice, ask_confirmation
 from ui.dialogs.new_canvas import NewCanvas
 from utils import config
+from utils.file_config import infer_image_format
 from utils.image_io import export_image as save_image
-from utils.image_io import infer_image_format
 from utils.log import get_logger
 
 
@@ -1,18 +1,27 @@
 import os
 import sys
 
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import QApplication
-
-from state import AppState
-from ui.editor import TilfEditor
-from utils import config
-from utils.log import get_logger
-from utils.log import setup as setup_logging
-from utils.resource_path import get_resource_path
+import batch
 
 
 def main() -> None:
+    if sys.argv[1:2] == [batch.BATCH_COMMAND]:
+        sys.exit(batch.main(sys.argv[2:]))
+    _run_editor()
+
+
+def _run_editor() -> None:
+    """Start the GUI; Qt and the editor are imported here so ``tilf batch`` starts without them."""
+    from PySide6.QtGui import QIcon
+    from PySide6.QtWidgets import QApplication
+
+    from state import AppState
+    from ui.editor import TilfEditor
+    from utils import config
+    from utils.log import get_logger
+    from utils.log import setup as setup_logging
+    from utils.resource_path import get_resource_path
+
     setup_logging()
     logger = get_logger()
 
@@ -30,8 +39,10 @@ def main() -> None:
     try:
         with open(stylesheet_path, "r", encoding="utf-8") as f:
             stylesheet = f.read()
-        stylesheet = stylesheet.replace("__SPINBOX_UP_ICON__", _stylesheet_url(config.SPINBOX_UP_ICON))
-        stylesheet = stylesheet.replace("__SPINBOX_DOWN_ICON__", _stylesheet_url(config.SPINBOX_DOWN_ICON))
+        up_icon_url = _stylesheet_url(get_resource_path(config.SPINBOX_UP_ICON))
+        down_icon_url = _stylesheet_url(get_resource_path(config.SPINBOX_DOWN_ICON))
+        stylesheet = stylesheet.replace("__SPINBOX_UP_ICON__", up_icon_url)
+        stylesheet = stylesheet.replace("__SPINBOX_DOWN_ICON__", down_icon_url)
         app.setStyleSheet(stylesheet)
         logger.info(config.MSG_STYLESHEET_LOADED_FMT.format(path=stylesheet_path))
     except FileNotFoundError:
@@ -45,8 +56,8 @@ def main() -> None:
     sys.exit(app.exec())
 
 
-def _stylesheet_url(relative_path: str) -> str:
-    return get_resource_path(relative_path).replace("\\", "/")
+def _stylesheet_url(path: str) -> str:
+    return path.replace("\\", "/")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtGui import QColor
 
+from core.change import ImageChange
 from utils import config
 
 
@@ -10,7 +11,7 @@ class AppState(QObject):
     primary_color_changed = Signal(QColor)
     secondary_color_changed = Signal(QColor)
     tool_changed = Signal(str)
-    image_changed = Signal()
+    image_changed = Signal(ImageChange)
 
     def __init__(self) -> None:
         super().__init__()
@@ -19,6 +20,8 @@ class AppState(QObject):
         self._primary_color: QColor = config.DEFAULT_PRIMARY_COLOR
         self._secondary_color: QColor = config.DEFAULT_SECONDARY_COLOR
         self._current_tool: str = config.ToolType.PENCIL
+        self._fill_tolerance: int = 0
+        self._is_global_fill: bool = False
 
     @property
     def is_dirty(self) -> bool:
@@ -61,6 +64,19 @@ class AppState(QObject):
             self._current_tool = tool_name
             self.tool_changed.emit(tool_name)
 
-    def notify_image_changed(self) -> None:
-        self.set_dirty(True)
-        self.image_changed.emit()
+    @property
+    def fill_tolerance(self) -> int:
+        return self._fill_tolerance
+
+    def set_fill_tolerance(self, tolerance: int) -> None:
+        self._fill_tolerance = max(0, min(config.MAX_FILL_TOLERANCE, tolerance))
+
+    @property
+    def is_global_fill(self) -> bool:
+        return self._is_global_fill
+
+    def set_global_fill(self, is_global: bool) -> None:
+        self._is_global_fill = is_global
+
+    def notify_image_changed(self, change: ImageChange) -> None:
+        self.image_changed.emit(change)
@@ -0,0 +1,13 @@
+import os
+from collections.abc import Iterator
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp() -> Iterator[object]:
+    from PySide6.QtWidgets import QApplication
+
+    yield QApplication.instance() or QApplication([])
@@ -0,0 +1,68 @@
+from core.document import CanvasDocument
+
+WHITE = 0xFFFFFFFF
+RED = 0xFFFF0000
+BLUE = 0xFF0000FF
+
+
+def _document(columns: int = 16, rows: int = 12) -> CanvasDocument:
+    return CanvasDocument(columns, rows, WHITE, history_limit=50, tile_size=8)
+
+
+def test_edits_after_a_shift_are_separate_undo_steps() -> None:
+    document = _document()
+    states = [document.pixels]
+    document.draw_pixel(1, 1, BLUE)
+    states.append(document.pixels)
+    document.shift_by(2, 1, WHITE)
+    states.append(document.pixels)
+    document.draw_line(0, 0, 15, 11, RED)
+    states.append(document.pixels)
+    document.flood_fill(15, 0, BLUE)
+    states.append(document.pixels)
+
+    for expected in reversed(states[:-1]):
+        assert document.undo()
+        assert document.pixels == expected
+    assert not document.undo()
+
+
+def test_edits_after_a_clear_are_separate_undo_steps() -> None:
+    document = _document()
+    document.draw_pixel(3, 3, RED)
+    document.clear(BLUE)
+    cleared = document.pixels
+    document.global_fill(0, 0, RED)
+
+    assert document.undo()
+    assert document.pixels == cleared
+    assert document.undo()
+    assert document.pixel_color(3, 3) == RED and document.pixel_color(0, 0) == WHITE
+
+
+def test_transaction_groups_primitive_edits() -> None:
+    document = _document()
+    with document.transaction("stroke"):
+        document.draw_pixel(0, 0, RED)
+        document.draw_line(0, 0, 5, 5, RED)
+        document.shift_by(1, 0, WHITE)
+
+    assert document.undo()
+    assert document.pixels == _document().pixels
+    assert not document.can_undo
+
+
+def test_abort_restores_the_background_color() -> None:
+    document = _document()
+    document.draw_pixel(2, 2, RED)
+    original = document.pixels
+
+    document.begin_transaction("background")
+    document.draw_pixel(4, 4, BLUE)
+    document.replace_background(BLUE)
+    document.abort_transaction()
+
+    assert document.background_color == WHITE
+    assert document.pixels == original
+    document.clear(document.background_color)
+    assert document.pixels == _document().pixels
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from core.document import CanvasDocument
+
+BLACK = 0xFF000000
+
+
+def _level_reference(document: CanvasDocument, shift: int) -> list[int]:
+    pixels = document.pixels
+    columns = document.columns
+    return [
+        pixels[(y << shift) * columns + (x << shift)]
+        for y in range(document.rows >> shift)
+        for x in range(columns >> shift)
+    ]
+
+
+def test_full_size_request_returns_no_reduction() -> None:
+    document = CanvasDocument(40, 30, BLACK, history_limit=50, tile_size=8)
+
+    assert document.reduced_pixels(40, 30) is None
+    assert document.reduced_pixels(21, 10) is None
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_levels_follow_edits_undo_and_resize(seed: int) -> None:
+    rng = random.Random(seed)
+    document = CanvasDocument(rng.randint(1, 90), rng.randint(1, 70), BLACK, history_limit=50, tile_size=8)
+    for _ in range(40):
+        columns, rows = document.columns, document.rows
+        x, y = rng.randrange(columns), rng.randrange(rows)
+        color = rng.choice([1, 2, 3, BLACK])
+        operation = rng.random()
+        if operation < 0.4:
+            document.draw_pixel(x, y, color)
+        elif operation < 0.55:
+            document.flood_fill(x, y, color)
+        elif operation < 0.65:
+            document.draw_shape("ellipse", x, y, rng.randrange(columns), rng.randrange(rows), False, color, True)
+        elif operation < 0.75:
+            document.undo()
+        elif operation < 0.8:
+            document.redo()
+        elif operation < 0.85:
+            document.shift_by(-5, 0, color)
+        elif operation < 0.9:
+            document.replace_background(color)
+        elif operation < 0.93:
+            document.reset(rng.randint(1, 90), rng.randint(1, 70), color)
+        else:
+            document.global_fill(x, y, color)
+
+        columns, rows = document.columns, document.rows
+        min_columns, min_rows = rng.randint(1, columns), rng.randint(1, rows)
+        reduced = document.reduced_pixels(min_columns, min_rows)
+        if reduced is None:
+            assert columns >> 1 < min_columns or rows >> 1 < min_rows
+            continue
+
+        level_columns, level_rows, pixels = reduced
+        shift = (columns // level_columns).bit_length() - 1
+        assert (level_columns, level_rows) == (columns >> shift, rows >> shift)
+        assert level_columns >= min_columns and level_rows >= min_rows
+        assert level_columns >> 1 < min_columns or level_rows >> 1 < min_rows
+        assert list(pixels) == _level_reference(document, shift)
@@ -0,0 +1,210 @@
+from collections.abc import Iterable
+
+import pytest
+
+from core.raster import ShapeBounds, line_points, shape_spans
+
+# Outlines drawn by the ellipse tool for a bounding box of (columns, rows); '#' is a painted cell.
+ELLIPSE_OUTLINES = {
+    (1, 1): (
+        "#",
+    ),
+    (1, 5): (
+        "#",
+        "#",
+        "#",
+        "#",
+        "#",
+    ),
+    (5, 1): (
+        "#####",
+    ),
+    (2, 2): (
+        "##",
+        "##",
+    ),
+    (3, 3): (
+        ".#.",
+        "#.#",
+        ".#.",
+    ),
+    (4, 4): (
+        ".##.",
+        "#..#",
+        "#..#",
+        ".##.",
+    ),
+    (5, 5): (
+        ".###.",
+        "#...#",
+        "#...#",
+        "#...#",
+        ".###.",
+    ),
+    (6, 6): (
+        "..##..",
+        ".#..#.",
+        "#....#",
+        "#....#",
+        ".#..#.",
+        "..##..",
+    ),
+    (7, 7): (
+        "..###..",
+        ".#...#.",
+        "#.....#",
+        "#.....#",
+        "#.....#",
+        ".#...#.",
+        "..###..",
+    ),
+    (8, 8): (
+        "..####..",
+        ".#....#.",
+        "#......#",
+        "#......#",
+        "#......#",
+        "#......#",
+        ".#....#.",
+        "..####..",
+    ),
+    (9, 5): (
+        "..#####..",
+        ".#.....#.",
+        "#.......#",
+        ".#.....#.",
+        "..#####..",
+    ),
+    (10, 4): (
+        "..######..",
+        "##......##",
+        "##......##",
+        "..######..",
+    ),
+    (4, 9): (
+        ".##.",
+        ".##.",
+        "#..#",
+        "#..#",
+        "#..#",
+        "#..#",
+        "#..#",
+        ".##.",
+        ".##.",
+    ),
+    (12, 7): (
+        "...######...",
+        ".##......##.",
+        "#..........#",
+        "#..........#",
+        "#..........#",
+        ".##......##.",
+        "...######...",
+    ),
+}
+
+MATRIX = [(columns, rows) for columns in range(1, 25) for rows in range(1, 25)]
+
+
+def _cells(bounds: ShapeBounds, filled: bool = False) -> set[tuple[int, int]]:
+    return {(col, row) for row, left, right in shape_spans("ellipse", bounds, filled) for col in range(left, right + 1)}
+
+
+def _render(cells: Iterable[tuple[int, int]], columns: int, rows: int) -> tuple[str, ...]:
+    grid = [["."] * columns for _ in range(rows)]
+    for col, row in cells:
+        grid[row][col] = "#"
+    return tuple("".join(line) for line in grid)
+
+
+def _is_connected(cells: set[tuple[int, int]]) -> bool:
+    start = next(iter(cells))
+    seen = {start}
+    pending = [start]
+    while pending:
+        col, row = pending.pop()
+        for neighbour in [(col + dx, row + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]:
+            if neighbour in cells and neighbour not in seen:
+                seen.add(neighbour)
+                pending.append(neighbour)
+    return seen == cells
+
+
+@pytest.mark.parametrize("size", ELLIPSE_OUTLINES)
+def test_ellipse_outline_matches_golden_mask(size: tuple[int, int]) -> None:
+    columns, rows = size
+    assert _render(_cells((0, 0, columns, rows)), columns, rows) == ELLIPSE_OUTLINES[size]
+
+
+@pytest.mark.parametrize("size", ELLIPSE_OUTLINES)
+def test_filled_ellipse_matches_golden_mask(size: tuple[int, int]) -> None:
+    columns, rows = size
+    expected = tuple(
+        "." * line.index("#") + "#" * (line.rindex("#") - line.index("#") + 1) + "." * (columns - 1 - line.rindex("#"))
+        for line in ELLIPSE_OUTLINES[size]
+    )
+    assert _render(_cells((0, 0, columns, rows), filled=True), columns, rows) == expected
+
+
+@pytest.mark.parametrize("size", MATRIX)
+def test_ellipse_is_a_closed_symmetric_outline_of_its_box(size: tuple[int, int]) -> None:
+    columns, rows = size
+    outline = _cells((0, 0, columns, rows))
+
+    assert all(0 <= col < columns and 0 <= row < rows for col, row in outline)
+    assert {col for col, _ in outline} >= {0, columns - 1}
+    assert {row for _, row in outline} >= {0, rows - 1}
+    assert outline == {(columns - 1 - col, row) for col, row in outline}
+    assert outline == {(col, rows - 1 - row) for col, row in outline}
+    assert _is_connected(outline)
+
+
+@pytest.mark.parametrize("size", MATRIX)
+def test_filled_ellipse_spans_the_outline_rows(size: tuple[int, int]) -> None:
+    columns, rows = size
+    outline = _cells((0, 0, columns, rows))
+    spans = shape_spans("ellipse", (0, 0, columns, rows), filled=True)
+
+    assert [row for row, _, _ in spans] == list(range(rows))
+    for row, left, right in spans:
+        row_cols = [col for col, outline_row in outline if outline_row == row]
+        assert (left, right) == (min(row_cols), max(row_cols))
+    filled = _cells((0, 0, columns, rows), filled=True)
+    for col in range(columns):
+        column_rows = sorted(row for filled_col, row in filled if filled_col == col)
+        assert column_rows == list(range(column_rows[0], column_rows[-1] + 1))
+
+
+@pytest.mark.parametrize("filled", [False, True])
+def test_ellipse_moves_with_its_bounds(filled: bool) -> None:
+    for columns, rows in MATRIX[::7]:
+        expected = {(col + 5, row - 3) for col, row in _cells((0, 0, columns, rows), filled)}
+        assert _cells((5, -3, columns, rows), filled) == expected
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        ((0, 0), (0, 0), [(0, 0)]),
+        ((0, 0), (4, 0), [(0, 0), (1, 0), (2, 0), (3, 0), (4, 0)]),
+        ((2, 3), (2, 0), [(2, 3), (2, 2), (2, 1), (2, 0)]),
+        ((0, 0), (3, 3), [(0, 0), (1, 1), (2, 2), (3, 3)]),
+        ((0, 0), (5, 2), [(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)]),
+        ((5, 2), (0, 0), [(5, 2), (4, 2), (3, 1), (2, 1), (1, 0), (0, 0)]),
+        ((0, 0), (1, 4), [(0, 0), (0, 1), (1, 2), (1, 3), (1, 4)]),
+    ],
+)
+def test_line_matches_golden_points(
+        start: tuple[int, int], end: tuple[int, int], expected: list[tuple[int, int]],
+) -> None:
+    assert line_points(*start, *end) == expected
+
+
+@pytest.mark.parametrize("end", [(dx, dy) for dx in range(-6, 7) for dy in range(-6, 7)])
+def test_line_steps_one_cell_at_a_time(end: tuple[int, int]) -> None:
+    points = line_points(0, 0, *end)
+
+    assert points[0] == (0, 0) and points[-1] == end
+    assert len(points) == max(abs(end[0]), abs(end[1])) + 1
+    for (col, row), (next_col, next_row) in zip(points, points[1:]):
+        assert max(abs(next_col - col), abs(next_row - row)) == 1
@@ -0,0 +1,50 @@
+import pytest
+from PySide6.QtCore import QEvent, QPoint, QPointF, QRect, Qt
+from PySide6.QtGui import QMouseEvent
+
+from core.raster import line_points
+from state import AppState
+from ui.canvas import Canvas
+from utils import config
+
+
+def _mouse_event(canvas: Canvas, kind: QEvent.Type, cell: QPoint) -> QMouseEvent:
+    rect = canvas.cell_rect_to_widget(QRect(cell, cell))
+    position = QPointF(rect.x() + 1, rect.y() + 1)
+    buttons = Qt.MouseButton.NoButton if kind == QEvent.Type.MouseButtonRelease else Qt.MouseButton.LeftButton
+    return QMouseEvent(
+        kind, position, position, canvas.mapToGlobal(position), Qt.MouseButton.LeftButton, buttons,
+        Qt.KeyboardModifier.NoModifier,
+    )
+
+
+def _drag(canvas: Canvas, cells: list[QPoint]) -> None:
+    canvas.mousePressEvent(_mouse_event(canvas, QEvent.Type.MouseButtonPress, cells[0]))
+    for cell in cells[1:]:
+        canvas.mouseMoveEvent(_mouse_event(canvas, QEvent.Type.MouseMove, cell))
+    canvas.mouseReleaseEvent(_mouse_event(canvas, QEvent.Type.MouseButtonRelease, cells[-1]))
+
+
+@pytest.fixture
+def canvas(qapp: object) -> Canvas:
+    app_state = AppState()
+    app_state.set_tool(config.ToolType.PENCIL)
+    return Canvas(app_state)
+
+
+@pytest.mark.parametrize("start", [(0, 0), (3, 2)])
+def test_fast_drag_fills_the_gap_between_moves(canvas: Canvas, start: tuple[int, int]) -> None:
+    end = (start[0] + 10, start[1] + 10)
+    _drag(canvas, [QPoint(*start), QPoint(*end)])
+
+    color = canvas.document.pixel_color(*start)
+    assert all(canvas.document.pixel_color(col, row) == color for col, row in line_points(*start, *end))
+
+
+def test_leaving_the_canvas_does_not_draw_a_chord(canvas: Canvas) -> None:
+    _drag(canvas, [QPoint(5, 5), QPoint(5, -3), QPoint(50, -3), QPoint(50, 5)])
+
+    color = canvas.document.pixel_color(5, 5)
+    assert all(canvas.document.pixel_color(5, row) == color for row in range(6))
+    assert all(canvas.document.pixel_color(50, row) == color for row in range(6))
+    assert canvas.document.pixel_color(27, 2) != color
@@ -6,10 +6,8 @@ from tools.base_tool import BaseTool
 
 class Fill(BaseTool):
     def mousePressEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
-        changed = self.canvas.flood_fill(cell.x(), cell.y(), self.app_state.primary_color)
-        if changed:
-            self.canvas.update()
-        return changed
+        fill = self.canvas.global_fill if self.app_state.is_global_fill else self.canvas.flood_fill
+        return fill(cell.x(), cell.y(), self.app_state.primary_color, self.app_state.fill_tolerance)
 
     def mouseMoveEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
         return False
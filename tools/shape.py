@@ -20,49 +20,57 @@ class Shape(BaseTool):
     def __init__(self, canvas: Canvas, app_state: AppState) -> None:
         super().__init__(canvas, app_state)
         self._shape_start_pos: QPoint | None = None
-        self._preview_image: QImage | None = None
+        self._preview: tuple[QRect, QImage] | None = None
 
     def mousePressEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
         self._shape_start_pos = cell
-        self._preview_image = None
+        self._preview = None
         return False
 
     def mouseMoveEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
         if self._shape_start_pos is None:
             return False
 
-        self._preview_image = self.canvas.create_shape_preview(
+        previous_preview = self._preview
+        self._preview = self.canvas.create_shape_preview(
             self.shape_kind,
             self._shape_start_pos,
             cell,
             bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier),
             self.app_state.primary_color,
+            bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier),
         )
-        self.canvas.update()
+        for preview in (previous_preview, self._preview):
+            if preview is not None:
+                self.canvas.update_cells(preview[0])
         return False
 
     def mouseReleaseEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
         if self._shape_start_pos is None:
             return False
 
+        previous_preview = self._preview
         changed = self.canvas.draw_shape(
             self.shape_kind,
             self._shape_start_pos,
             cell,
             bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier),
             self.app_state.primary_color,
+            bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier),
         )
-        self._preview_image = None
+        self._preview = None
         self._shape_start_pos = None
-        self.canvas.update()
+        if previous_preview is not None:
+            self.canvas.update_cells(previous_preview[0])
         return changed
 
     def paint(self, painter: QPainter) -> None:
-        if self._preview_image is not None:
+        if self._preview is not None:
+            cells, image = self._preview
             target_rect = QRect(
-                0,
-                0,
-                self.canvas.columns * self.canvas.cell_size,
-                self.canvas.rows * self.canvas.cell_size
+                cells.x() * self.canvas.cell_size,
+                cells.y() * self.canvas.cell_size,
+                cells.width() * self.canvas.cell_size,
+                cells.height() * self.canvas.cell_size,
             )
-            painter.drawImage(target_rect, self._preview_image)
+            painter.drawImage(target_rect, image)
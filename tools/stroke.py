@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QColor, QMouseEvent
+
+from state import AppState
+from tools.base_tool import BaseTool
+
+if TYPE_CHECKING:
+    from ui.canvas import Canvas
+
+
+class Stroke(BaseTool):
+    is_drag_tool = True
+
+    def __init__(self, canvas: Canvas, app_state: AppState) -> None:
+        super().__init__(canvas, app_state)
+        self._draw_color: QColor = self.app_state.primary_color
+        self._last_cell: QPoint | None = None
+
+    def stroke_color(self, event: QMouseEvent) -> QColor:
+        return self.app_state.primary_color
+
+    def mousePressEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
+        self._draw_color = self.stroke_color(event)
+        self._last_cell = cell
+        return self.canvas.draw_pixel(cell.x(), cell.y(), self._draw_color)
+
+    def mouseMoveEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
+        start = cell if self._last_cell is None else self._last_cell
+        self._last_cell = cell
+        return self.canvas.draw_line(start, cell, self._draw_color)
+
+    def mouseReleaseEvent(self, event: QMouseEvent, cell: QPoint) -> bool:
+        self._last_cell = None
+        return False
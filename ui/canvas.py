@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import QPoint, QRect, Qt, Signal
+from PySide6.QtCore import QEvent, QLine, QPoint, QRect, QSize, Qt, QTimer, Signal
 from PySide6.QtGui import (
     QColor,
     QImage,
@@ -12,11 +12,15 @@ from PySide6.QtGui import (
     QPaintEvent,
     QPen,
     QPixmap,
+    QResizeEvent,
     QWheelEvent,
 )
-from PySide6.QtWidgets import QWidget
+from PySide6.QtWidgets import QAbstractScrollArea
 
-from core.document import CanvasDocument, PixelSnapshot, ShapeKind
+from core.change import ChangeKind, ImageChange
+from core.dirty import DirtyRect, DirtyRegion
+from core.document import CanvasDocument, ShapeKind
+from core.layers import LayerSettings
 from state import AppState
 from tools.ellipse import Ellipse
 from tools.eraser import Eraser
@@ -26,16 +30,24 @@ from tools.pencil import Pencil
 from tools.rect import Rect
 from utils import config
 from utils.log import get_logger
-from utils.qt_image import color_to_value, image_from_pixels, image_to_pixels, transparent_value, value_to_color
+from utils.qt_image import (
+    color_to_value,
+    image_from_pixels,
+    image_to_pixels,
+    patch_image,
+    transparent_value,
+    value_to_color,
+)
 
 if TYPE_CHECKING:
     from tools.base_tool import BaseTool
 
 
-class Canvas(QWidget):
+class Canvas(QAbstractScrollArea):
     pixel_hovered = Signal(int, int, QColor)
     zoom_changed = Signal(int)
     history_changed = Signal(bool, bool)
+    layers_changed = Signal()
 
     def __init__(self, app_state: AppState) -> None:
         super().__init__()
@@ -45,6 +57,7 @@ class Canvas(QWidget):
             config.DEFAULT_HEIGHT,
             color_to_value(self.app_state.secondary_color),
             history_limit=config.HISTORY_LIMIT,
+            history_budget=config.HISTORY_MEMORY_LIMIT,
             tile_size=config.DEFAULT_TILE_SIZE,
         )
         self.cell_size: int = config.DEFAULT_ZOOM
@@ -52,17 +65,30 @@ class Canvas(QWidget):
         self.is_grid_visible: bool = True
         self._gesture_zoom_remainder = 0.0
         self._image_cache: QImage | None = None
-        self._pending_undo_snapshot: PixelSnapshot | None = None
+        self._is_repaint_scheduled = False
+        self._pending_change_kinds: set[ChangeKind] = set()
+        self._pending_change_region = DirtyRegion()
+        self._pending_hover: QPoint | None = None
+        self._last_hover: tuple[int, int, int] | None = None
+        self._hover_timer = QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(config.HOVER_REPORT_INTERVAL_MS)
+        self._hover_timer.timeout.connect(self._report_hover)
 
         self._is_drawing: bool = False
         self._tools: dict[str, BaseTool] = self._create_tools()
         self._current_tool: BaseTool = self._tools[config.ToolType.PENCIL]
+        self._current_tool_name: str = config.ToolType.PENCIL
 
         self._checkerboard_pixmap: QPixmap = self._create_checkerboard_pixmap(16)
+        self._grid_pattern_pixmap: QPixmap | None = None
+        self._grid_pattern_key: tuple[int, int, float] | None = None
 
-        self.setMouseTracking(True)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.viewport().setMouseTracking(True)
         self._connect_state()
-        self._update_size()
+        self._update_viewport()
         self._emit_history_changed()
 
     def _create_checkerboard_pixmap(self, size: int) -> QPixmap:
@@ -92,10 +118,19 @@ class Canvas(QWidget):
 
     @property
     def image(self) -> QImage:
+        if self._is_repaint_scheduled:
+            self._flush_changes()
         if self._image_cache is None:
             self._image_cache = image_from_pixels(self.columns, self.rows, self.document.pixels)
         return self._image_cache
 
+    def preview_image(self, size: QSize) -> QImage:
+        """Return the smallest pyramid level of the canvas that still covers ``size``."""
+        reduced = self.document.reduced_pixels(size.width(), size.height())
+        if reduced is None:
+            return self.image
+        return image_from_pixels(*reduced)
+
     @property
     def columns(self) -> int:
         return self.document.columns
@@ -104,6 +139,14 @@ class Canvas(QWidget):
     def rows(self) -> int:
         return self.document.rows
 
+    @property
+    def layers(self) -> tuple[LayerSettings, ...]:
+        return self.document.layers
+
+    @property
+    def active_layer_index(self) -> int:
+        return self.document.active_layer_index
+
     @property
     def tile_size(self) -> int:
         return self.document.tile_size
@@ -111,7 +154,8 @@ class Canvas(QWidget):
     def set_tool(self, tool_name: str) -> None:
         if tool_name in self._tools:
             self._current_tool = self._tools[tool_name]
-            self.setCursor(self._current_tool.get_cursor())
+            self._current_tool_name = tool_name
+            self.viewport().setCursor(self._current_tool.get_cursor())
         else:
             get_logger().warning(config.MSG_TOOL_WARNING_FMT.format(tool_name=tool_name))
 
@@ -119,6 +163,7 @@ class Canvas(QWidget):
             self, columns: int, rows: int, clear_history: bool = False,
             tile_size: int = 0,
     ) -> None:
+        self.end_transaction()
         self.document.reset(
             columns,
             rows,
@@ -126,62 +171,115 @@ class Canvas(QWidget):
             clear_history=clear_history,
             tile_size=tile_size,
         )
-        if clear_history:
-            self._pending_undo_snapshot = None
-        self._invalidate_image_cache()
-        self._update_size()
+        self._mark_changed("reset")
+        self._update_viewport()
         self._emit_history_changed()
-        self.app_state.notify_image_changed()
+        self.layers_changed.emit()
 
     def load_image(self, image: QImage) -> None:
-        self._pending_undo_snapshot = None
+        self.end_transaction()
         source = image.convertToFormat(QImage.Format.Format_ARGB32)
         self.document.load_pixels(source.width(), source.height(), image_to_pixels(source), transparent_value())
         self.app_state.set_secondary_color(QColor(config.COLOR_TRANSPARENT))
-        self._invalidate_image_cache()
-        self._update_size()
+        self._mark_changed("load")
+        self._update_viewport()
         self._emit_history_changed()
-        self.app_state.notify_image_changed()
+        self.layers_changed.emit()
 
     def clear_canvas(self) -> None:
+        self.end_transaction()
         if self.document.clear(color_to_value(self.app_state.secondary_color)):
-            self._invalidate_image_cache()
-            self.update()
+            self._mark_changed("clear")
             self._emit_history_changed()
-            self.app_state.notify_image_changed()
 
     def undo(self) -> None:
+        self.end_transaction()
         if self.document.undo():
-            self._invalidate_image_cache()
-            self._update_size()
+            self._mark_changed("undo")
             self._emit_history_changed()
-            self.app_state.notify_image_changed()
+            self.layers_changed.emit()
 
     def redo(self) -> None:
+        self.end_transaction()
         if self.document.redo():
-            self._invalidate_image_cache()
-            self._update_size()
+            self._mark_changed("redo")
             self._emit_history_changed()
-            self.app_state.notify_image_changed()
+            self.layers_changed.emit()
+
+    def set_active_layer(self, index: int) -> None:
+        self.end_transaction()
+        self.document.set_active_layer(index)
+        self.layers_changed.emit()
+
+    def add_layer(self) -> None:
+        self.end_transaction()
+        self.document.add_layer(config.LAYER_NAME_FMT.format(number=len(self.layers) + 1))
+        self._on_layers_edited()
+
+    def remove_layer(self, index: int) -> None:
+        self.end_transaction()
+        if self.document.remove_layer(index):
+            self._on_layers_edited()
+
+    def move_layer(self, index: int, new_index: int) -> None:
+        self.end_transaction()
+        if self.document.move_layer(index, new_index):
+            self._on_layers_edited()
+
+    def set_layer_settings(self, index: int, settings: LayerSettings) -> None:
+        self.end_transaction()
+        if self.document.set_layer_settings(index, settings):
+            self._on_layers_edited()
+
+    def erase_color(self) -> QColor:
+        """Return the colour that erases pixels of the active layer."""
+        if self.active_layer_index == 0:
+            return self.app_state.secondary_color
+        return QColor(config.COLOR_TRANSPARENT)
+
+    def begin_transaction(self, label: str) -> None:
+        """Group the following edits into one undo step and one image change until ``end_transaction``."""
+        self.document.begin_transaction(label)
+
+    def end_transaction(self) -> None:
+        self._is_drawing = False
+        if not self.document.in_transaction:
+            return
 
-    def shift_image(self, direction: str) -> None:
-        if self.document.shift(direction, color_to_value(self.app_state.secondary_color), config.SHIFT_OFFSETS):
-            self._invalidate_image_cache()
-            self.update()
+        if self.document.end_transaction():
+            self._emit_history_changed()
+        if not self.document.in_transaction:
+            self._schedule_flush()
+
+    def shift_image(self, direction: str, distance: int = 1, wrap: bool = False) -> None:
+        self.end_transaction()
+        background_color = color_to_value(self.app_state.secondary_color)
+        if self.document.shift(direction, background_color, config.SHIFT_OFFSETS, distance, wrap):
+            self._mark_changed("shift")
             self._emit_history_changed()
-            self.app_state.notify_image_changed()
 
     def draw_pixel(self, col: int, row: int, color: QColor) -> bool:
         if self.document.draw_pixel(col, row, color_to_value(color)):
-            self._invalidate_image_cache()
-            self.update(QRect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size))
+            self._mark_changed("stroke")
             return True
         return False
 
-    def flood_fill(self, col: int, row: int, color: QColor) -> bool:
-        changed = self.document.flood_fill(col, row, color_to_value(color))
+    def draw_line(self, start_cell: QPoint, end_cell: QPoint, color: QColor) -> bool:
+        if self.document.draw_line(start_cell.x(), start_cell.y(), end_cell.x(), end_cell.y(), color_to_value(color)):
+            self._mark_changed("stroke")
+            return True
+        return False
+
+    def flood_fill(self, col: int, row: int, color: QColor, tolerance: int = 0) -> bool:
+        changed = self.document.flood_fill(col, row, color_to_value(color), tolerance)
         if changed:
-            self._invalidate_image_cache()
+            self._mark_changed("fill")
+        return changed
+
+    def global_fill(self, col: int, row: int, color: QColor, tolerance: int = 0) -> bool:
+        changed = self.document.global_fill(col, row, color_to_value(color), tolerance)
+        if changed:
+            self._mark_changed("fill")
         return changed
 
     def pixel_color(self, col: int, row: int) -> QColor:
@@ -194,6 +292,7 @@ class Canvas(QWidget):
         end_cell: QPoint,
         force_square: bool,
         color: QColor,
+        filled: bool = False,
     ) -> bool:
         changed = self.document.draw_shape(
             shape_kind,
@@ -203,9 +302,10 @@ class Canvas(QWidget):
             end_cell.y(),
             force_square,
             color_to_value(color),
+            filled,
         )
         if changed:
-            self._invalidate_image_cache()
+            self._mark_changed("shape")
         return changed
 
     def create_shape_preview(
@@ -215,8 +315,9 @@ class Canvas(QWidget):
         end_cell: QPoint,
         force_square: bool,
         color: QColor,
-    ) -> QImage:
-        preview_pixels = self.document.create_shape_preview(
+        filled: bool = False,
+    ) -> tuple[QRect, QImage] | None:
+        preview = self.document.create_shape_preview(
             shape_kind,
             start_cell.x(),
             start_cell.y(),
@@ -224,44 +325,153 @@ class Canvas(QWidget):
             end_cell.y(),
             force_square,
             color_to_value(color),
+            filled,
+        )
+        if preview is None:
+            return None
+
+        left, top, width, height = preview.bounds
+        return QRect(left, top, width, height), image_from_pixels(width, height, preview.pixels)
+
+    def cell_rect_to_widget(self, cells: QRect) -> QRect:
+        """Map a rectangle of cells to viewport coordinates, including its trailing grid lines."""
+        origin = self._content_origin()
+        return QRect(
+            origin.x() + cells.x() * self.cell_size,
+            origin.y() + cells.y() * self.cell_size,
+            cells.width() * self.cell_size + 1,
+            cells.height() * self.cell_size + 1,
         )
-        return image_from_pixels(self.columns, self.rows, preview_pixels)
+
+    def update_cells(self, cells: QRect) -> None:
+        self.viewport().update(self.cell_rect_to_widget(cells))
 
     def _on_secondary_color_change(self, new_bg_color: QColor) -> None:
         if self.document.replace_background(color_to_value(new_bg_color)):
-            self._invalidate_image_cache()
-            self.update()
+            self._mark_changed("background")
             self._emit_history_changed()
-            self.app_state.notify_image_changed()
-
-    def _push_undo_snapshot(self, snapshot: PixelSnapshot) -> None:
-        self.document.commit_snapshot(snapshot)
-        self._emit_history_changed()
 
-    def _commit_pending_undo(self) -> None:
-        if self._pending_undo_snapshot is None:
-            return
-        self._push_undo_snapshot(self._pending_undo_snapshot)
-        self._pending_undo_snapshot = None
+    def _update_viewport(self) -> None:
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def _update_scrollbars(self) -> None:
+        content_size = self._content_size()
+        viewport_size = self.viewport().size()
+        for scrollbar, content_length, viewport_length in (
+            (self.horizontalScrollBar(), content_size.width(), viewport_size.width()),
+            (self.verticalScrollBar(), content_size.height(), viewport_size.height()),
+        ):
+            scrollbar.setRange(0, max(0, content_length - viewport_length))
+            scrollbar.setPageStep(viewport_length)
+            scrollbar.setSingleStep(self.cell_size)
+
+    def _content_size(self) -> QSize:
+        return QSize(self.columns * self.cell_size + 1, self.rows * self.cell_size + 1)
+
+    def _content_origin(self) -> QPoint:
+        content_size = self._content_size()
+        viewport_size = self.viewport().size()
+        x = (viewport_size.width() - content_size.width()) // 2
+        y = (viewport_size.height() - content_size.height()) // 2
+        return QPoint(
+            x if x > 0 else -self.horizontalScrollBar().value(),
+            y if y > 0 else -self.verticalScrollBar().value(),
+        )
 
-    def _update_size(self) -> None:
-        width = self.columns * self.cell_size + 1
-        height = self.rows * self.cell_size + 1
-        self.setFixedSize(width, height)
-        self.update()
+    def _cell_at(self, position: QPoint) -> QPoint:
+        content_position = position - self._content_origin()
+        return QPoint(content_position.x() // self.cell_size, content_position.y() // self.cell_size)
 
     def _invalidate_image_cache(self) -> None:
         self._image_cache = None
 
+    def _mark_changed(self, kind: ChangeKind) -> None:
+        self._pending_change_kinds.add(kind)
+        self.app_state.set_dirty(True)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if not self._is_repaint_scheduled:
+            self._is_repaint_scheduled = True
+            QTimer.singleShot(0, self._flush_changes)
+
+    def _flush_changes(self) -> None:
+        self._is_repaint_scheduled = False
+        dirty_rects = self.document.take_dirty_region()
+        self._patch_image_cache(dirty_rects)
+        for left, top, width, height in dirty_rects:
+            self.update_cells(QRect(left, top, width, height))
+            self._pending_change_region.add(left, top, left + width - 1, top + height - 1)
+
+        if self._pending_change_kinds and not self.document.in_transaction:
+            change = ImageChange(frozenset(self._pending_change_kinds), tuple(self._pending_change_region.take()))
+            self._pending_change_kinds.clear()
+            self.app_state.notify_image_changed(change)
+
+    def _patch_image_cache(self, dirty_rects: list[DirtyRect]) -> None:
+        image = self._image_cache
+        if image is None or not dirty_rects:
+            return
+
+        dirty_area = sum(width * height for _, _, width, height in dirty_rects)
+        canvas_area = self.columns * self.rows
+        if (image.width(), image.height()) != (self.columns, self.rows) or (
+            dirty_area > canvas_area * config.IMAGE_PATCH_MAX_RATIO
+        ):
+            self._invalidate_image_cache()
+            return
+
+        for left, top, width, height in dirty_rects:
+            patch_image(image, left, top, width, self.document.region_pixels(left, top, width, height))
+
+    def _report_hover(self) -> None:
+        cell = self._pending_hover
+        if cell is None or not self.document.contains(cell.x(), cell.y()):
+            return
+
+        value = self.document.pixel_color(cell.x(), cell.y())
+        hover = (cell.x(), cell.y(), value)
+        if hover != self._last_hover:
+            self._last_hover = hover
+            self.pixel_hovered.emit(cell.x(), cell.y(), value_to_color(value))
+
     def _emit_history_changed(self) -> None:
         self.history_changed.emit(self.document.can_undo, self.document.can_redo)
 
-    def set_cell_size(self, size: int) -> None:
+    def _on_layers_edited(self) -> None:
+        self._mark_changed("layers")
+        self._emit_history_changed()
+        self.layers_changed.emit()
+
+    def set_cell_size(self, size: int, anchor: QPoint | None = None) -> None:
         size = max(config.MIN_ZOOM, min(config.MAX_ZOOM, size))
-        if size != self.cell_size:
-            self.cell_size = size
-            self._update_size()
-            self.zoom_changed.emit(size)
+        if size == self.cell_size:
+            return
+
+        if anchor is None:
+            anchor = self.viewport().rect().center()
+        content_anchor = anchor - self._content_origin()
+        previous_size = self.cell_size
+        self.cell_size = size
+        self._update_scrollbars()
+        self.horizontalScrollBar().setValue(content_anchor.x() * size // previous_size - anchor.x())
+        self.verticalScrollBar().setValue(content_anchor.y() * size // previous_size - anchor.y())
+        self.viewport().update()
+        self.zoom_changed.emit(size)
+
+    def viewportEvent(self, event: QEvent) -> bool:
+        if isinstance(event, QNativeGestureEvent):
+            self.nativeGestureEvent(event)
+            return event.isAccepted()
+        return super().viewportEvent(event)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        self.viewport().scroll(dx, dy)
 
     def nativeGestureEvent(self, event: QNativeGestureEvent) -> None:
         gesture_type = event.gestureType()
@@ -274,7 +484,7 @@ class Canvas(QWidget):
             self._gesture_zoom_remainder += event.value() * config.MACOS_PINCH_ZOOM_SENSITIVITY
             zoom_steps = int(self._gesture_zoom_remainder)
             if zoom_steps != 0:
-                self.set_cell_size(self.cell_size + zoom_steps)
+                self.set_cell_size(self.cell_size + zoom_steps, event.position().toPoint())
                 self._gesture_zoom_remainder -= zoom_steps
             event.accept()
             return
@@ -287,36 +497,92 @@ class Canvas(QWidget):
         event.ignore()
 
     def paintEvent(self, event: QPaintEvent) -> None:
-        painter = QPainter(self)
-        painter.drawTiledPixmap(self.rect(), self._checkerboard_pixmap)
+        origin = self._content_origin()
+        exposed = event.rect().translated(-origin).intersected(QRect(QPoint(0, 0), self._content_size()))
+        if exposed.isEmpty():
+            return
 
-        target_rect = QRect(0, 0, self.columns * self.cell_size, self.rows * self.cell_size)
-        painter.drawImage(target_rect, self.image)
+        painter = QPainter(self.viewport())
+        painter.translate(origin)
+        painter.setClipRect(exposed)
+        painter.drawTiledPixmap(exposed, self._checkerboard_pixmap, exposed.topLeft())
+
+        step = self.cell_size
+        first_col = max(0, exposed.left() // step)
+        first_row = max(0, exposed.top() // step)
+        last_col = min(self.columns, exposed.right() // step + 1)
+        last_row = min(self.rows, exposed.bottom() // step + 1)
+        if first_col < last_col and first_row < last_row:
+            source_rect = QRect(first_col, first_row, last_col - first_col, last_row - first_row)
+            target_rect = QRect(
+                first_col * step,
+                first_row * step,
+                source_rect.width() * step,
+                source_rect.height() * step,
+            )
+            painter.drawImage(target_rect, self.image, source_rect)
 
         self._current_tool.paint(painter)
 
         if self.is_grid_visible and self.cell_size >= 4:
-            self._draw_grid(painter, target_rect)
-
-    def _draw_grid(self, painter: QPainter, target_rect: QRect) -> None:
-        width, height, step = target_rect.width(), target_rect.height(), self.cell_size
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, width + 1, step):
-            painter.drawLine(x, 0, x, height)
-        for y in range(0, height + 1, step):
-            painter.drawLine(0, y, width, y)
+            self._draw_grid(painter, QRect(0, 0, self.columns * step, self.rows * step), exposed)
+
+    def _draw_grid(self, painter: QPainter, target_rect: QRect, exposed: QRect) -> None:
+        area = exposed.adjusted(-1, -1, 1, 1)
+        pattern = self._grid_pattern()
+        if pattern is not None:
+            size = round(pattern.deviceIndependentSize().width())
+            left = exposed.left() // size * size
+            top = exposed.top() // size * size
+            painter.drawTiledPixmap(QRect(left, top, exposed.right() + 1 - left, exposed.bottom() + 1 - top), pattern)
+        else:
+            painter.setPen(QPen(self.grid_color, 1))
+            painter.drawLines(self._grid_lines(target_rect, area, self.cell_size))
 
         if self.tile_size > 1:
             painter.setPen(QPen(self.grid_color, 2))
-            tile_step = step * self.tile_size
-            for x in range(0, width + 1, tile_step):
-                painter.drawLine(x, 0, x, height)
-            for y in range(0, height + 1, tile_step):
-                painter.drawLine(0, y, width, y)
+            painter.drawLines(self._grid_lines(target_rect, area, self.cell_size * self.tile_size))
+
+    def _grid_pattern(self) -> QPixmap | None:
+        """Whole cells spanning whole device pixels, rebuilt only when the zoom, grid colour or pixel ratio change."""
+        ratio = self.devicePixelRatioF()
+        key = (self.cell_size, self.grid_color.rgba(), ratio)
+        if self._grid_pattern_key == key:
+            return self._grid_pattern_pixmap
+
+        step = self.cell_size
+        cells = next(
+            (
+                count
+                for count in range(1, config.GRID_PATTERN_MAX_CELLS + 1)
+                if abs(count * step * ratio - round(count * step * ratio)) < 1e-6
+            ),
+            None,
+        )
+        pixmap = None
+        if cells is not None:
+            size = cells * step
+            pixmap = QPixmap(round(size * ratio), round(size * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setPen(QPen(self.grid_color, 1))
+            painter.drawLines(self._grid_lines(QRect(0, 0, size, size), QRect(0, 0, size - 1, size - 1), step))
+            painter.end()
+
+        self._grid_pattern_pixmap = pixmap
+        self._grid_pattern_key = key
+        return pixmap
+
+    def _grid_lines(self, target_rect: QRect, area: QRect, step: int) -> list[QLine]:
+        top, bottom = max(0, area.top()), min(target_rect.height(), area.bottom())
+        left, right = max(0, area.left()), min(target_rect.width(), area.right())
+        return [QLine(x, top, x, bottom) for x in range(-(-left // step) * step, right + 1, step)] + [
+            QLine(left, y, right, y) for y in range(-(-top // step) * step, bottom + 1, step)
+        ]
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
-        pos = event.position().toPoint()
-        cell = QPoint(pos.x() // self.cell_size, pos.y() // self.cell_size)
+        cell = self._cell_at(event.position().toPoint())
 
         if not (0 <= cell.x() < self.columns and 0 <= cell.y() < self.rows):
             return
@@ -330,45 +596,30 @@ class Canvas(QWidget):
         if event.button() != Qt.MouseButton.LeftButton:
             return
 
-        snapshot = self.document.create_snapshot()
+        self.begin_transaction(self._current_tool_name)
+        self._current_tool.mousePressEvent(event, cell)
         if self._current_tool.is_drag_tool:
-            self._pending_undo_snapshot = snapshot
             self._is_drawing = True
-            changed = self._current_tool.mousePressEvent(event, cell)
-            if changed:
-                self._commit_pending_undo()
-                self.app_state.notify_image_changed()
-            return
-
-        if self._current_tool.mousePressEvent(event, cell):
-            self._push_undo_snapshot(snapshot)
-            self.app_state.notify_image_changed()
+        else:
+            self.end_transaction()
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        pos = event.position().toPoint()
-        cell = QPoint(pos.x() // self.cell_size, pos.y() // self.cell_size)
+        cell = self._cell_at(event.position().toPoint())
 
         if 0 <= cell.x() < self.columns and 0 <= cell.y() < self.rows:
-            self.pixel_hovered.emit(cell.x(), cell.y(), self.pixel_color(cell.x(), cell.y()))
-            if self._is_drawing:
-                changed = self._current_tool.mouseMoveEvent(event, cell)
-                if changed:
-                    self._commit_pending_undo()
-                    self.app_state.notify_image_changed()
+            self._pending_hover = cell
+            if not self._hover_timer.isActive():
+                self._hover_timer.start()
+        if self._is_drawing:
+            self._current_tool.mouseMoveEvent(event, cell)
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         if not self._is_drawing:
             return
 
-        pos = event.position().toPoint()
-        cell = QPoint(pos.x() // self.cell_size, pos.y() // self.cell_size)
-        changed = self._current_tool.mouseReleaseEvent(event, cell)
-        if changed:
-            self._commit_pending_undo()
-            self.app_state.notify_image_changed()
-
-        self._is_drawing = False
-        self._pending_undo_snapshot = None
+        cell = self._cell_at(event.position().toPoint())
+        self._current_tool.mouseReleaseEvent(event, cell)
+        self.end_transaction()
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         should_zoom = bool(
@@ -376,10 +627,10 @@ class Canvas(QWidget):
             or event.pixelDelta().isNull()
         )
         if not should_zoom:
-            event.ignore()
+            super().wheelEvent(event)
             return
 
         delta = event.angleDelta().y() // 120
         if delta != 0:
-            self.set_cell_size(self.cell_size + delta)
+            self.set_cell_size(self.cell_size + delta, event.position().toPoint())
             event.accept()
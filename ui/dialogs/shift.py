@@ -0,0 +1,53 @@
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QLabel,
+    QRadioButton,
+    QSpinBox,
+    QWidget,
+)
+
+from utils import config
+
+
+class ShiftCanvas(QDialog):
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle(config.TITLE_SHIFT_CANVAS)
+        layout = QFormLayout(self)
+        layout.addRow(QLabel(config.MSG_SHIFT_CANVAS))
+
+        self.direction_buttons: list[QRadioButton] = []
+        for option in config.SHIFT_OPTIONS:
+            radio_button = QRadioButton(option)
+            layout.addRow(radio_button)
+            self.direction_buttons.append(radio_button)
+
+        self.distance_spin = QSpinBox()
+        self.distance_spin.setRange(1, config.MAX_CANVAS_SIZE)
+        self.distance_spin.setSuffix(" px")
+        layout.addRow(config.LABEL_SHIFT_DISTANCE, self.distance_spin)
+
+        self.wrap_checkbox = QCheckBox(config.LABEL_SHIFT_WRAP)
+        self.wrap_checkbox.setToolTip(config.SHIFT_WRAP_TOOLTIP)
+        layout.addRow(self.wrap_checkbox)
+
+        buttons = QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        button_box = QDialogButtonBox(buttons)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addRow(button_box)
+
+    def get_direction(self) -> str | None:
+        for radio_button in self.direction_buttons:
+            if radio_button.isChecked():
+                return radio_button.text().lower()
+        return None
+
+    def get_distance(self) -> int:
+        return self.distance_spin.value()
+
+    def is_wrap_enabled(self) -> bool:
+        return self.wrap_checkbox.isChecked()
@@ -1,10 +1,11 @@
 import os
 from collections.abc import Callable
 
-from PySide6.QtCore import QEvent, QObject, Qt, QTimer
-from PySide6.QtGui import QCloseEvent, QColor, QDragEnterEvent, QDropEvent, QPixmap
+from PySide6.QtCore import QEvent, QObject, QSize, Qt, QTimer
+from PySide6.QtGui import QCloseEvent, QColor, QDragEnterEvent, QDropEvent
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
     QColorDialog,
     QComboBox,
     QDockWidget,
@@ -16,21 +17,26 @@ from PySide6.QtWidgets import (
     QPushButton,
     QScrollArea,
     QSlider,
+    QSpinBox,
     QStatusBar,
     QVBoxLayout,
     QWidget,
 )
 
+from core.change import ImageChange
+from core.color import color_hex
 from file_manager import FileManager
 from state import AppState
 from ui.canvas import Canvas
 from ui.dialogs.about import About
 from ui.dialogs.confirm import ask_choice, ask_confirmation
-from ui.dialogs.multiple_choice import MultipleChoice
+from ui.dialogs.shift import ShiftCanvas
 from ui.dialogs.update import UpdateDialog
 from ui.navigation import CanvasPanController
 from ui.toolbar import Toolbar
 from ui.widgets.color_palette import ColorPalette
+from ui.widgets.layer_panel import LayerPanel
+from ui.widgets.preview import PreviewLabel
 from utils import config
 from utils.log import get_logger
 from utils.update_checker import UpdateCheckError, check_latest_release
@@ -47,7 +53,6 @@ class TilfEditor(QMainWindow):
 
         self.canvas = Canvas(self.app_state)
         self.file_manager = FileManager(self, self.app_state, self.canvas)
-        self._preview_dirty = False
         self._fit_zoom_active = False
         self._applying_fit_zoom = False
 
@@ -63,15 +68,9 @@ class TilfEditor(QMainWindow):
         QTimer.singleShot(0, self.file_manager.prompt_recover_autosave)
 
     def _setup_central_widget(self) -> None:
-        self.canvas_scroll_area = QScrollArea()
-        self.canvas_scroll_area.setWidgetResizable(False)
-        self.canvas_scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.canvas_scroll_area.setWidget(self.canvas)
-        self.canvas_scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        self.canvas_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        self.canvas_scroll_area.viewport().installEventFilter(self)
-        self.pan_controller = CanvasPanController(self.canvas_scroll_area, self.canvas)
-        self.setCentralWidget(self.canvas_scroll_area)
+        self.canvas.viewport().installEventFilter(self)
+        self.pan_controller = CanvasPanController(self.canvas, self.canvas.viewport())
+        self.setCentralWidget(self.canvas)
 
     def _setup_status_bar(self) -> None:
         self.status_bar = QStatusBar(self)
@@ -171,10 +170,18 @@ class TilfEditor(QMainWindow):
         self.color_palette.recent_color_selected.connect(self.app_state.set_primary_color)
         self.color_palette.reset_requested.connect(self.reset_colors)
         self.color_palette.swap_requested.connect(self.swap_colors)
+        self.layer_panel = LayerPanel()
+        self.layer_panel.layer_selected.connect(self.canvas.set_active_layer)
+        self.layer_panel.add_requested.connect(self.canvas.add_layer)
+        self.layer_panel.remove_requested.connect(self.canvas.remove_layer)
+        self.layer_panel.move_requested.connect(self.canvas.move_layer)
+        self.layer_panel.settings_changed.connect(self.canvas.set_layer_settings)
         self.canvas_info_label = QLabel()
         self.zoom_value_label = QLabel()
 
-        self.preview_label = QLabel()
+        self.preview_label = PreviewLabel(
+            lambda: QSize(self.canvas.columns, self.canvas.rows), self.canvas.preview_image
+        )
         self.preview_label.setObjectName("previewLabel")
         self.preview_label.setMinimumSize(150, 150)
         self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -187,6 +194,8 @@ class TilfEditor(QMainWindow):
 
         layout.addWidget(self._create_preview_group())
         layout.addWidget(self._create_color_group())
+        layout.addWidget(self._create_layers_group())
+        layout.addWidget(self._create_fill_group())
         layout.addWidget(self._create_canvas_group())
         layout.addStretch()
 
@@ -202,6 +211,7 @@ class TilfEditor(QMainWindow):
         self._on_primary_color_changed(self.app_state.primary_color)
         self._on_secondary_color_changed(self.app_state.secondary_color)
         self._update_canvas_info()
+        self._sync_layer_panel()
         self._sync_zoom_controls(self.canvas.cell_size)
 
     def _create_preview_group(self) -> QGroupBox:
@@ -216,6 +226,31 @@ class TilfEditor(QMainWindow):
         layout.addWidget(self.color_palette)
         return group
 
+    def _create_layers_group(self) -> QGroupBox:
+        group = QGroupBox(config.LABEL_LAYERS)
+        layout = QVBoxLayout(group)
+        layout.addWidget(self.layer_panel)
+        return group
+
+    def _create_fill_group(self) -> QGroupBox:
+        group = QGroupBox(config.LABEL_FILL)
+        layout = QFormLayout(group)
+
+        tolerance_spin = QSpinBox()
+        tolerance_spin.setRange(0, config.MAX_FILL_TOLERANCE)
+        tolerance_spin.setValue(self.app_state.fill_tolerance)
+        tolerance_spin.setToolTip(config.FILL_TOLERANCE_TOOLTIP)
+        tolerance_spin.valueChanged.connect(self.app_state.set_fill_tolerance)
+
+        global_fill_check = QCheckBox(config.LABEL_FILL_GLOBAL)
+        global_fill_check.setChecked(self.app_state.is_global_fill)
+        global_fill_check.setToolTip(config.FILL_GLOBAL_TOOLTIP)
+        global_fill_check.toggled.connect(self.app_state.set_global_fill)
+
+        layout.addRow(config.LABEL_FILL_TOLERANCE, tolerance_spin)
+        layout.addRow(global_fill_check)
+        return group
+
     def _create_canvas_group(self) -> QGroupBox:
         group = QGroupBox(config.LABEL_CANVAS)
         layout = QFormLayout(group)
@@ -229,8 +264,7 @@ class TilfEditor(QMainWindow):
     def _connect_signals(self) -> None:
         self.app_state.dirty_changed.connect(self._update_window_title)
         self.app_state.file_path_changed.connect(self._update_window_title)
-        self.app_state.image_changed.connect(self._schedule_preview_refresh)
-        self.app_state.image_changed.connect(self._update_canvas_info)
+        self.app_state.image_changed.connect(self._on_image_changed)
         self.app_state.primary_color_changed.connect(
             self._on_primary_color_changed
         )
@@ -241,6 +275,7 @@ class TilfEditor(QMainWindow):
         self.canvas.pixel_hovered.connect(self._update_status_bar)
         self.canvas.zoom_changed.connect(self._on_canvas_zoom_changed)
         self.canvas.history_changed.connect(self._update_history_actions)
+        self.canvas.layers_changed.connect(self._sync_layer_panel)
         self.canvas.zoom_changed.connect(
             lambda z: self.status_bar.showMessage(
                 f"Zoom: {z}x",
@@ -266,10 +301,10 @@ class TilfEditor(QMainWindow):
         color = QColorDialog.getColor(self.canvas.grid_color, self, config.TITLE_GRID_COLOR)
         if color.isValid():
             self.canvas.grid_color = color
-            self.canvas.update()
+            self.canvas.viewport().update()
 
     def fit_canvas_to_window(self) -> None:
-        viewport_size = self.canvas_scroll_area.viewport().size()
+        viewport_size = self.canvas.viewport().size()
         width_zoom = max(config.MIN_ZOOM, (viewport_size.width() - 2) // max(1, self.canvas.columns))
         height_zoom = max(config.MIN_ZOOM, (viewport_size.height() - 2) // max(1, self.canvas.rows))
         self._fit_zoom_active = True
@@ -324,14 +359,14 @@ class TilfEditor(QMainWindow):
 
     def toggle_grid(self, checked: bool) -> None:
         self.canvas.is_grid_visible = checked
-        self.canvas.update()
+        self.canvas.viewport().update()
 
     def shift_canvas(self) -> None:
-        dialog = MultipleChoice(config.TITLE_SHIFT_CANVAS, config.MSG_SHIFT_CANVAS, config.SHIFT_OPTIONS, self)
+        dialog = ShiftCanvas(self)
         if dialog.exec():
-            selected = dialog.get_selected_option()
-            if selected:
-                self.canvas.shift_image(selected.lower())
+            direction = dialog.get_direction()
+            if direction:
+                self.canvas.shift_image(direction, dialog.get_distance(), dialog.is_wrap_enabled())
 
     def about(self) -> int:
         return About(self).exec()
@@ -357,18 +392,21 @@ class TilfEditor(QMainWindow):
 
     def _update_status_bar(self, col: int, row: int, color: QColor) -> None:
         try:
-            self.status_bar.showMessage(f"x={col}, y={row} | color={color.name(QColor.NameFormat.HexArgb)}")
+            self.status_bar.showMessage(f"x={col}, y={row} | color={color_hex(color.rgba())}")
         except RuntimeError as error:
             get_logger().debug("Skipping status bar update after widget teardown: %s", error)
 
-    def _schedule_preview_refresh(self) -> None:
-        if not self._preview_dirty:
-            self._preview_dirty = True
-            QTimer.singleShot(50, self._refresh_preview)
+    def _on_image_changed(self, change: ImageChange) -> None:
+        self.preview_label.apply_change(change)
+        if change.replaces_canvas:
+            self._update_canvas_info()
 
     def _update_canvas_info(self) -> None:
         self.canvas_info_label.setText(f"{self.canvas.columns} x {self.canvas.rows}px")
 
+    def _sync_layer_panel(self) -> None:
+        self.layer_panel.set_layers(self.canvas.layers, self.canvas.active_layer_index)
+
     def _update_zoom_label(self, zoom: int) -> None:
         self.zoom_value_label.setText(f"{zoom}x")
 
@@ -427,18 +465,6 @@ class TilfEditor(QMainWindow):
         if self.redo_toolbar_action is not None:
             self.redo_toolbar_action.setEnabled(can_redo)
 
-    def _refresh_preview(self) -> None:
-        self._preview_dirty = False
-        if self.canvas.image.isNull():
-            return None
-        pixmap = QPixmap.fromImage(self.canvas.image)
-        scaled_pixmap = pixmap.scaled(
-            self.preview_label.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.FastTransformation
-        )
-        return self.preview_label.setPixmap(scaled_pixmap)
-
     def dragEnterEvent(self, event: QDragEnterEvent) -> None:
         mime_data = event.mimeData()
         if mime_data.hasUrls() and any(
@@ -489,7 +515,7 @@ class TilfEditor(QMainWindow):
 
     def eventFilter(self, watched: QObject, event: QEvent) -> bool:
         if (
-            watched is self.canvas_scroll_area.viewport()
+            watched is self.canvas.viewport()
             and event.type() == QEvent.Type.Resize
             and self._fit_zoom_active
         ):
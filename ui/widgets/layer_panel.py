@@ -0,0 +1,125 @@
+from collections.abc import Sequence
+from dataclasses import replace
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QComboBox,
+    QFormLayout,
+    QHBoxLayout,
+    QListWidget,
+    QListWidgetItem,
+    QPushButton,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.blend import BLEND_MODES, OPAQUE
+from core.layers import LayerSettings
+from utils import config
+
+
+class LayerPanel(QWidget):
+    """Layer list shown top layer first; every edit is reported with the layer's stack index."""
+
+    layer_selected = Signal(int)
+    add_requested = Signal()
+    remove_requested = Signal(int)
+    move_requested = Signal(int, int)
+    settings_changed = Signal(int, object)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._layers: tuple[LayerSettings, ...] = ()
+        self._active_index = 0
+
+        self.layer_list = QListWidget()
+        self.layer_list.setToolTip(config.LAYER_VISIBLE_TOOLTIP)
+        self.layer_list.currentRowChanged.connect(self._on_current_row_changed)
+        self.layer_list.itemChanged.connect(self._on_item_changed)
+
+        self.opacity_spin = QSpinBox()
+        self.opacity_spin.setRange(0, 100)
+        self.opacity_spin.setSuffix("%")
+        self.opacity_spin.valueChanged.connect(self._on_opacity_changed)
+
+        self.blend_mode_combo = QComboBox()
+        for mode in BLEND_MODES:
+            self.blend_mode_combo.addItem(config.BLEND_MODE_LABELS[mode], mode)
+        self.blend_mode_combo.currentIndexChanged.connect(self._on_blend_mode_changed)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+        layout.addWidget(self.layer_list)
+        layout.addLayout(self._create_action_layout())
+        layout.addLayout(self._create_settings_layout())
+
+    def set_layers(self, layers: Sequence[LayerSettings], active_index: int) -> None:
+        self._layers = tuple(layers)
+        self._active_index = active_index
+        active = self._layers[active_index]
+        for widget in (self.layer_list, self.opacity_spin, self.blend_mode_combo):
+            widget.blockSignals(True)
+
+        self.layer_list.clear()
+        for settings in reversed(self._layers):
+            item = QListWidgetItem(settings.name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if settings.visible else Qt.CheckState.Unchecked)
+            self.layer_list.addItem(item)
+        self.layer_list.setCurrentRow(self._row(active_index))
+        self.opacity_spin.setValue(round(active.opacity * 100 / OPAQUE))
+        self.blend_mode_combo.setCurrentIndex(BLEND_MODES.index(active.blend_mode))
+
+        for widget in (self.layer_list, self.opacity_spin, self.blend_mode_combo):
+            widget.blockSignals(False)
+        self.remove_button.setEnabled(len(self._layers) > 1)
+        self.up_button.setEnabled(active_index < len(self._layers) - 1)
+        self.down_button.setEnabled(active_index > 0)
+
+    def _create_action_layout(self) -> QHBoxLayout:
+        layout = QHBoxLayout()
+        add_button = QPushButton(config.BTN_ADD_LAYER)
+        add_button.clicked.connect(lambda checked=False: self.add_requested.emit())
+        self.remove_button = QPushButton(config.BTN_REMOVE_LAYER)
+        self.remove_button.clicked.connect(lambda checked=False: self.remove_requested.emit(self._active_index))
+        self.up_button = QPushButton(config.BTN_LAYER_UP)
+        self.up_button.clicked.connect(
+            lambda checked=False: self.move_requested.emit(self._active_index, self._active_index + 1)
+        )
+        self.down_button = QPushButton(config.BTN_LAYER_DOWN)
+        self.down_button.clicked.connect(
+            lambda checked=False: self.move_requested.emit(self._active_index, self._active_index - 1)
+        )
+        for button in (add_button, self.remove_button, self.up_button, self.down_button):
+            layout.addWidget(button)
+        return layout
+
+    def _create_settings_layout(self) -> QFormLayout:
+        layout = QFormLayout()
+        layout.addRow(config.LABEL_LAYER_OPACITY, self.opacity_spin)
+        layout.addRow(config.LABEL_LAYER_BLEND_MODE, self.blend_mode_combo)
+        return layout
+
+    def _row(self, index: int) -> int:
+        return len(self._layers) - 1 - index
+
+    def _on_current_row_changed(self, row: int) -> None:
+        if row >= 0:
+            self.layer_selected.emit(self._row(row))
+
+    def _on_item_changed(self, item: QListWidgetItem) -> None:
+        index = self._row(self.layer_list.row(item))
+        visible = item.checkState() == Qt.CheckState.Checked
+        settings = self._layers[index]
+        if visible != settings.visible:
+            self.settings_changed.emit(index, replace(settings, visible=visible))
+
+    def _on_opacity_changed(self, percent: int) -> None:
+        settings = self._layers[self._active_index]
+        self.settings_changed.emit(self._active_index, replace(settings, opacity=round(percent * OPAQUE / 100)))
+
+    def _on_blend_mode_changed(self, combo_index: int) -> None:
+        settings = self._layers[self._active_index]
+        self.settings_changed.emit(self._active_index, replace(settings, blend_mode=BLEND_MODES[combo_index]))
@@ -0,0 +1,104 @@
+from collections.abc import Callable
+
+from PySide6.QtCore import QRect, QRectF, QSize, Qt, QTimer
+from PySide6.QtGui import QImage, QPainter, QPaintEvent, QResizeEvent
+from PySide6.QtWidgets import QLabel
+
+from core.change import ImageChange
+from core.dirty import DirtyRect, DirtyRegion
+from utils import config
+
+
+class PreviewLabel(QLabel):
+    """Thumbnail of the canvas that re-samples only the regions changed since its last refresh.
+
+    ``image_source`` gets the thumbnail size and may return any reduction of the
+    canvas that still covers it; dirty rectangles stay in canvas coordinates.
+    """
+
+    def __init__(self, canvas_size: Callable[[], QSize], image_source: Callable[[QSize], QImage]) -> None:
+        super().__init__()
+        self._canvas_size = canvas_size
+        self._image_source = image_source
+        self._thumbnail: QImage | None = None
+        self._pending_region = DirtyRegion()
+        self._needs_rebuild = True
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(config.PREVIEW_REFRESH_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self._refresh_if_visible)
+
+    def apply_change(self, change: ImageChange) -> None:
+        if change.replaces_canvas:
+            self._needs_rebuild = True
+        elif not self._needs_rebuild:
+            for left, top, width, height in change.region:
+                self._pending_region.add(left, top, left + width - 1, top + height - 1)
+
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._needs_rebuild = True
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+        self._refresh()
+        if self._thumbnail is None:
+            return
+
+        target = QRect(0, 0, self._thumbnail.width(), self._thumbnail.height())
+        target.moveCenter(self.contentsRect().center())
+        painter = QPainter(self)
+        painter.drawImage(target, self._thumbnail)
+
+    def _refresh_if_visible(self) -> None:
+        if self.isVisible() and not self.visibleRegion().isEmpty():
+            self.update()
+
+    def _refresh(self) -> None:
+        if not self._needs_rebuild and not self._pending_region:
+            return
+
+        canvas_size = self._canvas_size()
+        rects = self._pending_region.take()
+        if canvas_size.isEmpty():
+            self._thumbnail = None
+        elif self._needs_rebuild or self._thumbnail is None:
+            self._rebuild(canvas_size)
+        else:
+            self._patch(canvas_size, rects)
+        self._needs_rebuild = False
+
+    def _rebuild(self, canvas_size: QSize) -> None:
+        size = canvas_size.scaled(self.contentsRect().size(), Qt.AspectRatioMode.KeepAspectRatio)
+        if size.isEmpty():
+            self._thumbnail = None
+            return
+
+        self._thumbnail = QImage(size, QImage.Format.Format_ARGB32)
+        self._draw_source(self._image_source(size), None)
+
+    def _patch(self, canvas_size: QSize, rects: list[DirtyRect]) -> None:
+        if self._thumbnail is None:
+            return
+
+        source = self._image_source(self._thumbnail.size())
+        scale_x = self._thumbnail.width() / canvas_size.width()
+        scale_y = self._thumbnail.height() / canvas_size.height()
+        for left, top, width, height in rects:
+            area = QRectF(left * scale_x, top * scale_y, width * scale_x, height * scale_y)
+            self._draw_source(source, area.toAlignedRect().adjusted(-1, -1, 1, 1))
+
+    def _draw_source(self, source: QImage, clip: QRect | None) -> None:
+        if self._thumbnail is None:
+            return
+
+        painter = QPainter(self._thumbnail)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        if clip is not None:
+            painter.setClipRect(clip)
+        painter.drawImage(self._thumbnail.rect(), source)
+        painter.end()
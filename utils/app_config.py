@@ -2,7 +2,10 @@ APP_VERSION = "0.5"
 APP_NAME = "Tilf - Pixel Art Editor"
 AUTOSAVE_DIR = "tilf_autosaves"
 HISTORY_LIMIT = 50
+HISTORY_MEMORY_LIMIT = 128 * 1024 * 1024
+HOVER_REPORT_INTERVAL_MS = 16
 MACOS_PINCH_ZOOM_SENSITIVITY = 12
+PREVIEW_REFRESH_INTERVAL_MS = 50
 PROJECT_REPOSITORY = "danterolle/tilf"
 RELEASES_URL = f"https://github.com/{PROJECT_REPOSITORY}/releases"
 LATEST_RELEASE_API_URL = f"https://api.github.com/repos/{PROJECT_REPOSITORY}/releases/latest"
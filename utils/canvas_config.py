@@ -16,6 +16,9 @@ MIN_CANVAS_SIZE = 1
 MAX_CANVAS_SIZE = 4096
 MIN_TILE_SIZE = 8
 MAX_TILE_SIZE = 128
+MAX_FILL_TOLERANCE = 255
+GRID_PATTERN_MAX_CELLS = 8
+IMAGE_PATCH_MAX_RATIO = 0.25
 CANVAS_PRESETS = {
     "Default tile grid": (DEFAULT_WIDTH, DEFAULT_HEIGHT),
     "16 x 16 icon": (16, 16),
@@ -3,7 +3,10 @@ from utils.app_config import (  # noqa: F401
     APP_VERSION,
     AUTOSAVE_DIR,
     HISTORY_LIMIT,
+    HISTORY_MEMORY_LIMIT,
+    HOVER_REPORT_INTERVAL_MS,
     MACOS_PINCH_ZOOM_SENSITIVITY,
+    PREVIEW_REFRESH_INTERVAL_MS,
     RELEASES_URL,
 )
 from utils.canvas_config import (  # noqa: F401
@@ -19,7 +22,10 @@ from utils.canvas_config import (  # noqa: F401
     DEFAULT_TILE_SIZE,
     DEFAULT_WIDTH,
     DEFAULT_ZOOM,
+    GRID_PATTERN_MAX_CELLS,
+    IMAGE_PATCH_MAX_RATIO,
     MAX_CANVAS_SIZE,
+    MAX_FILL_TOLERANCE,
     MAX_TILE_COLS,
     MAX_TILE_ROWS,
     MAX_TILE_SIZE,
@@ -66,6 +72,8 @@ from utils.ui_text import (  # noqa: F401
     ACTION_UNDO,
     ACTION_ZOOM_IN,
     ACTION_ZOOM_OUT,
+    BLEND_MODE_LABELS,
+    BTN_ADD_LAYER,
     BTN_CANCEL,
     BTN_CLEAR,
     BTN_DISCARD,
@@ -77,31 +85,46 @@ from utils.ui_text import (  # noqa: F401
     BTN_IGNORE,
     BTN_KEEP_EDITING,
     BTN_KEEP_TRANSPARENCY,
+    BTN_LAYER_DOWN,
+    BTN_LAYER_UP,
     BTN_OK,
     BTN_OPEN_RECOVERY,
     BTN_OPEN_RELEASES,
+    BTN_REMOVE_LAYER,
     BTN_RESET_COLORS,
     BTN_RESET_ZOOM,
     BTN_SAVE,
     BTN_SWAP_COLORS,
     DIRTY_MARKER,
+    FILL_GLOBAL_TOOLTIP,
+    FILL_TOLERANCE_TOOLTIP,
     LABEL_BACKGROUND_COLOR,
     LABEL_CANVAS,
     LABEL_CANVAS_SIZE,
     LABEL_COLORS,
+    LABEL_FILL,
+    LABEL_FILL_GLOBAL,
+    LABEL_FILL_TOLERANCE,
     LABEL_GRID,
     LABEL_HEIGHT,
     LABEL_INSPECTOR,
+    LABEL_LAYER_BLEND_MODE,
+    LABEL_LAYER_OPACITY,
+    LABEL_LAYERS,
     LABEL_PRESET,
     LABEL_PREVIEW,
     LABEL_PRIMARY_COLOR,
     LABEL_RECENT_COLORS,
     LABEL_RESULTING_CANVAS,
+    LABEL_SHIFT_DISTANCE,
+    LABEL_SHIFT_WRAP,
     LABEL_TILE_COLUMNS,
     LABEL_TILE_ROWS,
     LABEL_TILE_SIZE,
     LABEL_WIDTH,
     LABEL_ZOOM,
+    LAYER_NAME_FMT,
+    LAYER_VISIBLE_TOOLTIP,
     MENU_EDIT,
     MENU_FILE,
     MENU_HELP,
@@ -129,6 +152,7 @@ from utils.ui_text import (  # noqa: F401
     PROJECT_EMAIL_URL,
     PROJECT_URL,
     RESET_ZOOM_TOOLTIP_FMT,
+    SHIFT_WRAP_TOOLTIP,
     TITLE_ABOUT,
     TITLE_CHECK_UPDATES,
     TITLE_CLEAR_CANVAS,
@@ -1,3 +1,5 @@
+import os
+
 OPEN_FILE_FILTER = "Images (*.png *.jpg *.jpeg *.bmp)"
 SAVE_FILE_FILTER = "PNG (*.png);;JPEG (*.jpg *.jpeg);;BMP (*.bmp)"
 SUPPORTED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
@@ -15,3 +17,12 @@ STYLESHEET_FILENAME = "style.qss"
 LOGO_RESOURCE = "assets/logo.png"
 SPINBOX_UP_ICON = "assets/icons/spin_up.png"
 SPINBOX_DOWN_ICON = "assets/icons/spin_down.png"
+
+
+def infer_image_format(path: str) -> str:
+    file_ext = os.path.splitext(path)[1].upper().replace(".", "")
+    if file_ext in JPEG_EXTENSIONS:
+        return IMAGE_FORMAT_JPEG
+    if file_ext == IMAGE_FORMAT_BMP:
+        return IMAGE_FORMAT_BMP
+    return IMAGE_FORMAT_PNG
@@ -1,4 +1,3 @@
-import os
 from typing import cast
 
 from PySide6.QtGui import QColor, QImage, QPainter
@@ -6,15 +5,6 @@ from PySide6.QtGui import QColor, QImage, QPainter
 from utils import config
 
 
-def infer_image_format(path: str) -> str:
-    file_ext = os.path.splitext(path)[1].upper().replace(".", "")
-    if file_ext in config.JPEG_EXTENSIONS:
-        return config.IMAGE_FORMAT_JPEG
-    if file_ext == config.IMAGE_FORMAT_BMP:
-        return config.IMAGE_FORMAT_BMP
-    return config.IMAGE_FORMAT_PNG
-
-
 def export_image(image: QImage, filename: str, file_format: str | None, is_transparent: bool) -> bool:
     qt_file_format = _qt_save_format(file_format)
     image_to_save = image.copy()
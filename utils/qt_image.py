@@ -3,6 +3,7 @@ from collections.abc import Sequence
 from PySide6.QtGui import QColor, QImage
 
 from core.document import ColorValue
+from core.pixel_buffer import PIXEL_BYTES, PIXEL_TYPECODE, PixelBuffer, buffer_from_bytes
 
 
 def color_to_value(color: QColor) -> ColorValue:
@@ -13,18 +14,35 @@ def value_to_color(value: ColorValue) -> QColor:
     return QColor.fromRgba(value)
 
 
-def image_to_pixels(image: QImage) -> tuple[ColorValue, ...]:
+def image_to_pixels(image: QImage) -> PixelBuffer:
+    """Copy an image into a pixel buffer with one memcpy of its ARGB32 bits."""
     source = image.convertToFormat(QImage.Format.Format_ARGB32)
-    return tuple(source.pixel(col, row) for row in range(source.height()) for col in range(source.width()))
+    return buffer_from_bytes(memoryview(source.constBits())[:source.sizeInBytes()])
 
 
 def image_from_pixels(columns: int, rows: int, pixels: Sequence[ColorValue]) -> QImage:
     image = QImage(columns, rows, QImage.Format.Format_ARGB32)
-    for row in range(rows):
-        for col in range(columns):
-            image.setPixel(col, row, pixels[row * columns + col])
+    if columns and rows:
+        memoryview(image.bits())[:] = _pixel_bytes(pixels)
     return image
 
 
+def patch_image(image: QImage, left: int, top: int, width: int, pixels: Sequence[ColorValue]) -> None:
+    """Copy a ``width``-wide block of pixels into an ARGB32 image at ``(left, top)``, one row at a time."""
+    data = _pixel_bytes(pixels)
+    bits = memoryview(image.bits())
+    stride = image.bytesPerLine()
+    row_bytes = width * PIXEL_BYTES
+    for row in range(len(data) // row_bytes if row_bytes else 0):
+        start = (top + row) * stride + left * PIXEL_BYTES
+        bits[start:start + row_bytes] = data[row * row_bytes:(row + 1) * row_bytes]
+
+
 def transparent_value() -> ColorValue:
     return color_to_value(QColor("transparent"))
+
+
+def _pixel_bytes(pixels: Sequence[ColorValue]) -> memoryview:
+    if not isinstance(pixels, PixelBuffer):
+        pixels = PixelBuffer(PIXEL_TYPECODE, pixels)
+    return memoryview(pixels).cast("B")
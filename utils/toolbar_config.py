@@ -60,13 +60,13 @@ TOOLS: dict[str, ToolDefinition] = {
         text="Rectangle",
         icon="assets/icons/square.png",
         shortcut="R",
-        tooltip="Draw a rectangle. Hold Shift for a perfect square.",
+        tooltip="Draw a rectangle. Hold Shift for a perfect square, Ctrl/Cmd to fill it.",
     ),
     ToolType.ELLIPSE: ToolDefinition(
         text="Ellipse",
         icon="assets/icons/circle.png",
         shortcut="C",
-        tooltip="Draw an ellipse. Hold Shift for a perfect circle.",
+        tooltip="Draw an ellipse. Hold Shift for a perfect circle, Ctrl/Cmd to fill it.",
     ),
 }
 
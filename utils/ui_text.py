@@ -43,7 +43,7 @@ MSG_DISCARD_CHANGES = "You have unsaved changes. Do you want to continue and dis
 MSG_SAVE_BEFORE_QUIT = "You have unsaved changes. Do you want to save before quitting?"
 MSG_TRANSPARENCY_PROMPT = "Save with a transparent background?"
 MSG_CLEAR_CONFIRM = "Are you sure you want to clear the canvas?"
-MSG_SHIFT_CANVAS = "Shift canvas 1px to the:"
+MSG_SHIFT_CANVAS = "Shift canvas to the:"
 MSG_NEW_CANVAS_HELP = (
     "Canvas size is the final image size. Changing tile columns, rows, or tile size creates an exact tile grid."
 )
@@ -60,6 +60,7 @@ LABEL_TILE_COLUMNS = "Tile columns:"
 LABEL_TILE_ROWS = "Tile rows:"
 LABEL_TILE_SIZE = "Tile size:"
 BTN_OK = "OK"
+BTN_ADD_LAYER = "Add"
 BTN_OPEN_RELEASES = "Open releases"
 BTN_CANCEL = "Cancel"
 BTN_CLEAR = "Clear"
@@ -71,6 +72,9 @@ BTN_GITHUB = "GitHub"
 BTN_IGNORE = "Ignore"
 BTN_KEEP_EDITING = "Keep editing"
 BTN_KEEP_TRANSPARENCY = "Keep transparency"
+BTN_LAYER_DOWN = "Down"
+BTN_LAYER_UP = "Up"
+BTN_REMOVE_LAYER = "Remove"
 BTN_RESET_COLORS = "Reset"
 BTN_RESET_ZOOM = "Reset Zoom"
 BTN_OPEN_RECOVERY = "Open recovery"
@@ -81,18 +85,52 @@ LABEL_BACKGROUND_COLOR = "Background:"
 LABEL_CANVAS = "Canvas"
 LABEL_CANVAS_SIZE = "Size:"
 LABEL_COLORS = "Colors"
+LABEL_FILL = "Fill"
+LABEL_FILL_GLOBAL = "Replace all matching pixels"
+LABEL_FILL_TOLERANCE = "Tolerance:"
 LABEL_GRID = "Grid:"
 LABEL_INSPECTOR = "Inspector"
+LABEL_LAYER_BLEND_MODE = "Blend:"
+LABEL_LAYER_OPACITY = "Opacity:"
+LABEL_LAYERS = "Layers"
 LABEL_PRIMARY_COLOR = "Primary:"
 LABEL_PREVIEW = "Preview"
 LABEL_RECENT_COLORS = "Recent colors:"
+LABEL_SHIFT_DISTANCE = "Distance:"
+LABEL_SHIFT_WRAP = "Wrap around edges"
 LABEL_ZOOM = "Zoom:"
 TOOLBAR_TITLE = "Main Toolbar"
 
 DIRTY_MARKER = "*"
 UNTITLED_NAME = "Untitled"
 WINDOW_TITLE_FMT = "{marker}{name} - " + APP_NAME
+LAYER_NAME_FMT = "Layer {number}"
+LAYER_VISIBLE_TOOLTIP = "Uncheck to hide the layer; hidden layers are left out of the image and exports."
+BLEND_MODE_LABELS = {
+    "normal": "Normal",
+    "multiply": "Multiply",
+    "screen": "Screen",
+    "darken": "Darken",
+    "lighten": "Lighten",
+}
 RESET_ZOOM_TOOLTIP_FMT = "Reset zoom to {zoom}x"
+FILL_TOLERANCE_TOOLTIP = "Maximum difference allowed on each RGBA channel. 0 fills only the exact color."
+FILL_GLOBAL_TOOLTIP = "Recolor every matching pixel in the image instead of only the connected area."
+SHIFT_WRAP_TOOLTIP = "Pixels pushed past one edge reappear on the opposite edge, so tiles stay seamless."
+
+BATCH_DESCRIPTION = "Apply editing operations to many images at once, using every CPU core."
+BATCH_NO_FILES = "no supported images match the given patterns"
+BATCH_NOT_POSITIVE_FMT = "expected a positive integer, got {value}"
+BATCH_TOLERANCE_RANGE_FMT = "expected a tolerance from 0 to {maximum}, got {value}"
+BATCH_DUPLICATE_OUTPUT_FMT = "several sources would be written to {path}"
+BATCH_OUT_OF_BOUNDS_FMT = "pixel ({col}, {row}) is outside the image"
+BATCH_READ_ERROR_FMT = "cannot read image {path}"
+BATCH_WRITE_ERROR_FMT = "cannot write image {path}"
+BATCH_PROGRESS_FMT = "[{done}/{total}] {source} -> {destination} ({milliseconds:.0f} ms)"
+BATCH_FAILED_FMT = "[{done}/{total}] {source}: FAILED: {error}"
+BATCH_SUMMARY_FMT = "{succeeded} of {total} files processed in {seconds:.2f} s"
+BATCH_FAILURES_HEADER = "Failed files:"
+BATCH_FAILURE_FMT = "  {source}: {error}"
 
 MSG_ICON_NOT_FOUND_FMT = "Tilf icon not found at: {path}"
 MSG_STYLESHEET_LOADED_FMT = "Stylesheet loaded from: {path}"